@@ -11,6 +11,7 @@ import redis
 from flask import Flask
 from flask.json.provider import DefaultJSONProvider
 from flask.logging import default_handler
+from flask_compress import Compress
 from flask_cors import CORS
 from rq import Queue
 
@@ -66,6 +67,9 @@ def create_app(test_config=None):
     if test_config is not None:
         app.config.update(test_config)
 
+    # response compression, see COMPRESS_* in config
+    Compress(app)
+
     app.register_blueprint(generic_api)
 
     app.register_blueprint(meshing_api_legacy)
@@ -1,14 +1,25 @@
 # pylint: disable=invalid-name, missing-docstring, logging-fstring-interpolation
 
 import os
+import sys
+import array
+import zlib
+import struct
+import datetime
 from typing import Sequence
 from time import mktime
-from functools import wraps
+from functools import lru_cache, wraps
+from threading import Lock
+from collections import defaultdict
 
 import numpy as np
 import networkx as nx
+import orjson
 import requests
-from flask import current_app, json, request
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from cachetools import LRUCache, TTLCache
+from flask import Response, current_app, json, request
 from scipy import spatial
 from werkzeug.datastructures import ImmutableMultiDict
 
@@ -16,9 +27,21 @@ from pychunkedgraph import __version__
 from pychunkedgraph.graph import ChunkedGraph
 from pychunkedgraph.graph.client import get_default_client_info
 from pychunkedgraph.graph import exceptions as cg_exceptions
+from pychunkedgraph.utils.gcloud import get_default_credentials
 
 
-PCG_CACHE = {}
+PCG_CACHE_SIZE = int(os.environ.get("PCG_CACHE_SIZE", 32))
+# seconds before a cached instance is reloaded, 0 keeps it until evicted
+# each worker process has its own cache, a meta change reaches all of them
+# only after the ttl (or a restart)
+PCG_CACHE_TTL = int(os.environ.get("PCG_CACHE_TTL", 0))
+# bounded, each entry holds a bigtable client and its grpc channels
+if PCG_CACHE_TTL > 0:
+    PCG_CACHE = TTLCache(maxsize=PCG_CACHE_SIZE, ttl=PCG_CACHE_TTL)
+else:
+    PCG_CACHE = LRUCache(maxsize=PCG_CACHE_SIZE)
+_PCG_CACHE_LOCK = Lock()
+_PCG_TABLE_LOCKS = defaultdict(Lock)
 
 
 def get_app_base_path():
@@ -29,11 +52,38 @@ def get_instance_folder_path():
     return os.path.join(get_app_base_path(), "instance")
 
 
+def _get_config_snapshot(key, build):
+    """
+    Value derived from the app's config, built on first use per app.
+    App config does not change after startup, avoid a lookup per request.
+    """
+    app = current_app._get_current_object()  # pylint: disable=protected-access
+    try:
+        return app.extensions[key]
+    except KeyError:
+        value = build(app.config)
+        app.extensions[key] = value
+        return value
+
+
+def _get_virtual_tables():
+    return _get_config_snapshot(
+        "pcg_virtual_tables", lambda config: config.get("VIRTUAL_TABLES", None)
+    )
+
+
+def _get_whitelisted_graph_ids() -> frozenset:
+    return _get_config_snapshot(
+        "pcg_whitelisted_graph_ids",
+        lambda config: frozenset(config["PCG_GRAPH_IDS"]),
+    )
+
+
 def remap_public(func=None, *, edit=False, check_node_ids=False):
     def mydecorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            virtual_tables = current_app.config.get("VIRTUAL_TABLES", None)
+            virtual_tables = _get_virtual_tables()
 
             # if not virtual configuration just return
             if virtual_tables is None:
@@ -103,7 +153,7 @@ def remap_public(func=None, *, edit=False, check_node_ids=False):
                 # as well if the endpoint configured us to.
                 if check_node_ids:
                     node_ids = np.array(
-                        json.loads(request.data)["node_ids"], dtype=np.uint64
+                        orjson.loads(request.data)["node_ids"], dtype=np.uint64
                     )
                     timestamps = cg.get_node_timestamps(node_ids)
                     if not np.all(timestamps < np.datetime64(v_timestamp)):
@@ -121,86 +171,318 @@ def remap_public(func=None, *, edit=False, check_node_ids=False):
         return mydecorator
 
 
+_COMPACT_KW = {"separators": (",", ":")}
+_PRETTY_KW = {"separators": (", ", ": "), "indent": 2}
+_JSON_SETTINGS_KEY = "pcg_json_response_settings"
+_ORJSON_OPTIONS = (
+    orjson.OPT_SERIALIZE_NUMPY
+    | orjson.OPT_NON_STR_KEYS
+    | orjson.OPT_PASSTHROUGH_DATETIME
+)
+
+
+def _get_json_response_settings():
+    """
+    Snapshot of the app's JSON settings, taken on first use per app.
+    These are constant for the lifetime of the app and every endpoint
+    needs them, so avoid resolving them one by one per response.
+    """
+    app = current_app._get_current_object()  # pylint: disable=protected-access
+    try:
+        return app.extensions[_JSON_SETTINGS_KEY]
+    except KeyError:
+        pretty = app.json.compact == False or app.debug
+        options = _ORJSON_OPTIONS
+        if app.json.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        settings = (pretty, options, app.response_class, app.json.mimetype)
+        app.extensions[_JSON_SETTINGS_KEY] = settings
+        return settings
+
+
+def _orjson_default(obj):
+    """Mirrors `CustomJsonEncoder` for types orjson does not handle natively."""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, datetime.datetime):
+        return obj.__str__()
+    raise TypeError
+
+
+def _dumps_compact(data, options: int = _ORJSON_OPTIONS):
+    """
+    Compact JSON with orjson; returns None if `data` contains
+    something only the app's JSON encoder knows how to handle.
+    """
+    try:
+        return orjson.dumps(data, default=_orjson_default, option=options)
+    except orjson.JSONEncodeError:
+        return None
+
+
+class RawJSON:
+    """Already encoded JSON, `jsonify_with_kwargs` writes it as is."""
+
+    __slots__ = ("b",)
+
+    def __init__(self, b: bytes):
+        self.b = b
+
+
 def jsonify_with_kwargs(data, as_response=True, **kwargs):
-    kwargs.setdefault("separators", (",", ":"))
+    """
+    Compact responses without custom kwargs are encoded with orjson.
+    Unlike the app's encoder it writes NaN and Infinity as null and float32
+    values in their shortest float32 form (0.1, not 0.10000000149011612).
+    Pretty (debug) responses and custom kwargs use the app's encoder.
+    """
+    pretty, options, response_class, mimetype = _get_json_response_settings()
+    int64_as_str = kwargs.get("int64_as_str", False)
+    if isinstance(data, RawJSON) and pretty:
+        # debug output is formatted by the app's encoder like any other response
+        data = orjson.loads(data.b)
+    if isinstance(data, RawJSON):
+        resp = data.b
+    elif not (pretty or int64_as_str) and kwargs.keys() <= {"int64_as_str"}:
+        resp = _dumps_compact(data, options)
+    else:
+        resp = None
 
-    if current_app.json.compact == False or current_app.debug:
-        kwargs["indent"] = 2
-        kwargs["separators"] = (", ", ": ")
+    if resp is not None:
+        if not as_response:
+            return resp.decode()
+        # already utf-8 encoded
+        return response_class(resp + b"\n", mimetype=mimetype)
 
-    resp = json.dumps(data, **kwargs)
+    if pretty:
+        resp = json.dumps(data, **kwargs, **_PRETTY_KW)
+    else:
+        resp = json.dumps(data, **{**_COMPACT_KW, **kwargs})
     if as_response:
-        return current_app.response_class(
-            resp + "\n", mimetype=current_app.json.mimetype
-        )
+        return response_class(resp + "\n", mimetype=mimetype)
     else:
         return resp
 
 
+_ENVELOPE_PREFIXES = {}
+
+
+def jsonify_bytes_body(body_bytes: bytes, envelope_key: str = "data"):
+    """
+    Response for `{envelope_key: body}` when body is already JSON encoded.
+    The constant envelope is encoded only once per key.
+    """
+    try:
+        prefix = _ENVELOPE_PREFIXES[envelope_key]
+    except KeyError:
+        prefix = b"{" + orjson.dumps(envelope_key) + b":"
+        _ENVELOPE_PREFIXES[envelope_key] = prefix
+    return jsonify_with_kwargs(RawJSON(prefix + body_bytes + b"}"))
+
+
 def ensure_correct_version(cg: ChunkedGraph) -> bool:
     current_major_version = int(__version__.split(".", maxsplit=1)[0])
+    # reads from the backend, only do it once
+    version = cg.version
     try:
-        graph_major_version = int(cg.version.split(".")[0])
-        valid = graph_major_version == current_major_version
-        assert valid, f"v{cg.version} not supported, server version {__version__}."
-        return True
+        graph_major_version = int(version.split(".")[0])
     except (AttributeError, TypeError):
         # graph not versioned, later checked if whitelisted
         return False
+    # not an assert, this must also run with python -O
+    if graph_major_version != current_major_version:
+        raise ValueError(f"v{version} not supported, server version {__version__}.")
+    return True
+
+
+@lru_cache(maxsize=1)
+def _get_client_info():
+    """Constant for the process lifetime, build it once."""
+    client_info = get_default_client_info()
+    credentials, _ = get_default_credentials()
+    config = client_info.CONFIG._replace(CREDENTIALS=credentials)
+    return client_info._replace(CONFIG=config)
+
+
+def _get_table_lock(table_id) -> Lock:
+    with _PCG_CACHE_LOCK:
+        return _PCG_TABLE_LOCKS[table_id]
+
+
+def _release_table_lock(table_id, lock: Lock) -> None:
+    # table ids come from clients, locks only live while an instance is created
+    with _PCG_CACHE_LOCK:
+        if _PCG_TABLE_LOCKS.get(table_id) is lock:
+            del _PCG_TABLE_LOCKS[table_id]
 
 
 def get_cg(table_id, skip_cache: bool = False):
     current_app.table_id = table_id
-    if skip_cache is False:
-        try:
-            return PCG_CACHE[table_id]
-        except KeyError:
-            pass
+    if skip_cache:
+        return _create_cg(table_id)
+
+    try:
+        return _cache_get(table_id)
+    except KeyError:
+        pass
+
+    # concurrent first requests for a table share one instance
+    lock = _get_table_lock(table_id)
+    try:
+        with lock:
+            try:
+                return _cache_get(table_id)
+            except KeyError:
+                return _create_cg(table_id)
+    finally:
+        _release_table_lock(table_id, lock)
+
+
+def _cache_get(table_id) -> ChunkedGraph:
+    # lookups update recency in the LRU, so they need the lock too
+    with _PCG_CACHE_LOCK:
+        return PCG_CACHE[table_id]
+
 
-    cg = ChunkedGraph(graph_id=table_id, client_info=get_default_client_info())
+def _cache_put(table_id, cg: ChunkedGraph) -> None:
+    # evicted instances are not closed explicitly, requests in flight
+    # may still hold them; channels are released when they are collected
+    with _PCG_CACHE_LOCK:
+        PCG_CACHE[table_id] = cg
+
+
+def _create_cg(table_id):
+    cg = ChunkedGraph(graph_id=table_id, client_info=_get_client_info())
     version_valid = ensure_correct_version(cg)
     if version_valid:
-        PCG_CACHE[table_id] = cg
+        _cache_put(table_id, cg)
         return cg
 
-    if cg.graph_id in current_app.config["PCG_GRAPH_IDS"]:
+    if cg.graph_id in _get_whitelisted_graph_ids():
         current_app.logger.warning(f"Serving whitelisted graph {cg.graph_id}.")
-        PCG_CACHE[table_id] = cg
+        _cache_put(table_id, cg)
         return cg
     raise ValueError(f"Graph {cg.graph_id} not supported.")
 
 
+_BOUNDS_SEPARATORS = str.maketrans("_-", "  ")
+
+
+def parse_bounds(bounds: str) -> np.ndarray:
+    """Parse `x0-x1_y0-y1_z0-z1` into a [[x0, y0, z0], [x1, y1, z1]] array."""
+    values = bounds.translate(_BOUNDS_SEPARATORS).split()
+    # split() drops empty parts, reject them like int("") did
+    n_pairs = bounds.count("_") + 1
+    if bounds.count("-") != n_pairs or len(values) != 2 * n_pairs:
+        raise ValueError(f"Invalid bounds {bounds!r}, expected x0-x1_y0-y1_z0-z1.")
+    return np.array(values, dtype=int).reshape(-1, 2).T
+
+
+_TRUE_STRINGS = frozenset(("true", "1", "t", "yes", "y"))
+_FALSE_STRINGS = frozenset(("false", "0", "f", "no", "n"))
+
+
 def toboolean(value):
     """Transform value to boolean type.
     :param value: bool/int/str
     :return: bool
     :raises: ValueError, if value is not boolean.
     """
-    if not value:
+    if value is None or value == "":
         raise ValueError("Can't convert null to boolean")
 
-    if isinstance(value, bool):
+    if value is True or value is False:
         return value
-    try:
-        value = value.lower()
-    except Exception as exc:
-        raise ValueError(f"Can't convert {value} to boolean: {exc}") from exc
+    if isinstance(value, int):
+        return bool(value)
+    if not isinstance(value, str):
+        raise ValueError(f"Can't convert {value} to boolean")
 
-    if value in ("true", "1"):
+    value = value.lower()
+    if value in _TRUE_STRINGS:
         return True
-    if value in ("false", "0"):
+    if value in _FALSE_STRINGS:
         return False
 
     raise ValueError(f"Can't convert {value} to boolean")
 
 
+_PACK_UINT64 = tuple(struct.Struct(f"={n}Q").pack for n in range(9))
+
+
 def tobinary(ids):
     """Transform id(s) to binary format
 
     :param ids: uint64 or list of uint64s
     :return: binary
     """
-    return np.array(ids).tobytes()
+    if isinstance(ids, np.ndarray):
+        if ids.size and ids.dtype.kind not in "iu":
+            # float ids have already lost precision, object and str arrays
+            # would be coerced element by element without any checks
+            raise ValueError(f"Can't convert {ids.dtype} ids to uint64")
+        if ids.size and ids.dtype.kind == "i" and ids.min() < 0:
+            raise ValueError("Can't convert negative ids to uint64")
+        if not ids.flags.c_contiguous:
+            # `tobytes` on a non-contiguous array is much slower than a copy first
+            ids = np.ascontiguousarray(ids)
+        if ids.dtype != np.uint64:
+            ids = ids.astype(np.uint64, copy=False)
+        return ids.tobytes()
+    if isinstance(ids, (int, np.integer)):
+        return int(ids).to_bytes(8, sys.byteorder)
+    if isinstance(ids, (list, tuple)):
+        try:
+            if len(ids) < len(_PACK_UINT64):
+                # allocating an array costs more than packing a few ids directly
+                return _PACK_UINT64[len(ids)](*ids)
+            # converts each int straight into the buffer, no dtype discovery
+            return array.array("Q", ids).tobytes()
+        except (TypeError, OverflowError, struct.error):
+            # nested, negative or non-integer ids, validated in the ndarray path
+            return tobinary(np.asarray(ids))
+    return tobinary(np.asarray(ids))
+
+
+_STREAM_CHUNK_SIZE = 256 * 1024
+
+
+def stream_gzip_ndarray(arr: np.ndarray, level: int = 1):
+    """
+    Yield gzip compressed chunks of the array's bytes,
+    peak memory is a chunk rather than the whole compressed copy.
+    """
+    # wbits 31 for gzip container instead of raw zlib
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    view = memoryview(np.ascontiguousarray(arr)).cast("B")
+    for i in range(0, len(view), _STREAM_CHUNK_SIZE):
+        chunk = compressor.compress(view[i : i + _STREAM_CHUNK_SIZE])
+        if chunk:
+            yield chunk
+    yield compressor.flush()
+
+
+def tobinary_response(ids):
+    """
+    `tobinary` for endpoints; large uint64 arrays are gzip streamed
+    to clients that accept it instead of being compressed in one piece.
+    """
+    accept_encoding = request.headers.get("Accept-Encoding", "")
+    if (
+        isinstance(ids, np.ndarray)
+        and ids.dtype == np.uint64
+        and ids.nbytes > _STREAM_CHUNK_SIZE
+        and "gzip" in accept_encoding.lower()
+    ):
+        level = current_app.config.get("COMPRESS_LEVEL", 1)
+        return Response(
+            stream_gzip_ndarray(ids, level=level),
+            mimetype="application/octet-stream",
+            headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"},
+        )
+    return tobinary(ids)
 
 
 def tobinary_multiples(arr):
@@ -209,7 +491,30 @@ def tobinary_multiples(arr):
     :param arr: list of uint64 or list of uint64s
     :return: binary
     """
-    return [np.array(arr_i).tobytes() for arr_i in arr]
+    if len(arr) and len(set(np.size(arr_i) for arr_i in arr)) == 1:
+        # uniform lengths: convert once and slice the raw buffer per row,
+        # `tobinary` validates the ids the same way as for ragged rows
+        raw = tobinary(np.asarray(arr).reshape(len(arr), -1))
+        row_size = len(raw) // len(arr)
+        return [raw[i * row_size : (i + 1) * row_size] for i in range(len(arr))]
+    return [tobinary(arr_i) for arr_i in arr]
+
+
+def tobinary_id_mapping(mapping: dict) -> bytes:
+    """Transform {id: ids} to binary format.
+    Each entry is `[key, count, values...]`, all uint64 to keep alignment.
+
+    :param mapping: dict of id to list of uint64
+    :return: binary
+    """
+    parts = []
+    for key, values in mapping.items():
+        values = np.asarray(values, dtype=np.uint64).reshape(-1)
+        parts.append(np.array([int(key), values.size], dtype=np.uint64))
+        parts.append(values)
+    if len(parts) == 0:
+        return b""
+    return np.concatenate(parts).tobytes()
 
 
 def handle_supervoxel_id_lookup(
@@ -260,12 +565,25 @@ def handle_supervoxel_id_lookup(
     return atomic_ids
 
 
+@lru_cache(maxsize=1)
+def get_session() -> requests.Session:
+    """Shared session, keeps connections to the auth service alive."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=64,
+        max_retries=Retry(total=2, backoff_factor=0.1),
+    )
+    session.mount("https://", adapter)
+    return session
+
+
 def get_username_dict(user_ids, auth_token) -> dict:
     AUTH_URL = os.environ.get("AUTH_URL", None)
     if AUTH_URL is None:
         raise cg_exceptions.ChunkedGraphError("No AUTH_URL defined")
 
-    users_request = requests.get(
+    users_request = get_session().get(
         f"https://{AUTH_URL}/api/v1/username?id={','.join(map(str, np.unique(user_ids)))}",
         headers={"authorization": "Bearer " + auth_token},
         timeout=5,
@@ -273,17 +591,30 @@ def get_username_dict(user_ids, auth_token) -> dict:
     return {x["id"]: x["name"] for x in users_request.json()}
 
 
+# user id -> (name, affiliation), names rarely change
+_USERINFO_CACHE = TTLCache(maxsize=4096, ttl=3600)
+_USERINFO_CACHE_LOCK = Lock()
+
+
 def get_userinfo_dict(user_ids, auth_token):
     AUTH_URL = os.environ.get("AUTH_URL", None)
 
     if AUTH_URL is None:
         raise cg_exceptions.ChunkedGraphError("No AUTH_URL defined")
 
-    users_request = requests.get(
-        f"https://{AUTH_URL}/api/v1/user?id={','.join(map(str, np.unique(user_ids)))}",
-        headers={"authorization": "Bearer " + auth_token},
-        timeout=5,
-    )
-    return {x["id"]: x["name"] for x in users_request.json()}, {
-        x["id"]: x["pi"] for x in users_request.json()
-    }
+    user_ids = [int(x) for x in np.unique(user_ids)]
+    with _USERINFO_CACHE_LOCK:
+        info = {x: _USERINFO_CACHE[x] for x in user_ids if x in _USERINFO_CACHE}
+
+    missing = [x for x in user_ids if x not in info]
+    if len(missing) > 0:
+        users_request = get_session().get(
+            f"https://{AUTH_URL}/api/v1/user?id={','.join(map(str, missing))}",
+            headers={"authorization": "Bearer " + auth_token},
+            timeout=5,
+        )
+        fetched = {x["id"]: (x["name"], x["pi"]) for x in users_request.json()}
+        with _USERINFO_CACHE_LOCK:
+            _USERINFO_CACHE.update(fetched)
+        info.update(fetched)
+    return {k: v[0] for k, v in info.items()}, {k: v[1] for k, v in info.items()}
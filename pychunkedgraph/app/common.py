@@ -1,12 +1,13 @@
 # pylint: disable=invalid-name, missing-docstring, unspecified-encoding
 
 import os
+import gzip
 import json
+import logging
 import time
 import traceback
-from datetime import datetime
+from datetime import datetime, timezone
 
-from cloudvolume import compression
 from google.api_core.exceptions import GoogleAPIError
 from flask import current_app, g, jsonify, request
 
@@ -50,7 +51,9 @@ def _log_request(response_time):
 
 def before_request():
     current_app.request_start_time = time.time()
-    current_app.request_start_date = datetime.utcnow()
+    current_app.request_start_date = datetime.fromtimestamp(
+        current_app.request_start_time, timezone.utc
+    )
     try:
         current_app.user_id = g.auth_user["id"]
     except (AttributeError, KeyError):
@@ -60,33 +63,25 @@ def before_request():
     current_app.request_type = None
     content_encoding = request.headers.get("Content-Encoding", "")
     if "gzip" in content_encoding.lower():
-        request.data = compression.decompress(request.data, "gzip")
+        # inflate while reading, the compressed body is never held in full
+        with gzip.GzipFile(fileobj=request.stream) as f:
+            request.data = f.read()
 
 
 def after_request(response):
     response_time = (time.time() - current_app.request_start_time) * 1000
-    accept_encoding = request.headers.get("Accept-Encoding", "")
-
     _log_request(response_time)
-
-    if "gzip" not in accept_encoding.lower():
-        return response
-
-    response.direct_passthrough = False
-    if (
-        response.status_code < 200
-        or response.status_code >= 300
-        or "Content-Encoding" in response.headers
-    ):
-        return response
-
-    response.data = compression.gzip_compress(response.data)
-    response.headers["Content-Encoding"] = "gzip"
-    response.headers["Vary"] = "Accept-Encoding"
-    response.headers["Content-Length"] = len(response.data)
+    # compression is done by flask-compress, registered in create_app
     return response
 
 
+def _format_traceback(e):
+    # only needed for the log record
+    if not current_app.logger.isEnabledFor(logging.ERROR):
+        return None
+    return "".join(traceback.format_exception(e))
+
+
 def unhandled_exception(e):
     status_code = 500
     response_time = (time.time() - current_app.request_start_time) * 1000
@@ -105,7 +100,7 @@ def unhandled_exception(e):
             "request_data": request.data,
             "response_time": response_time,
             "response_code": status_code,
-            "traceback": tb,
+            "traceback": "".join(tb),
         }
     )
 
@@ -114,8 +109,10 @@ def unhandled_exception(e):
         "duration": response_time,
         "code": status_code,
         "message": str(e),
-        "traceback": tb,
     }
+    # only debug servers send the traceback, a list of lines as before
+    if current_app.debug:
+        resp["traceback"] = tb
 
     return jsonify(resp), status_code
 
@@ -123,7 +120,7 @@ def unhandled_exception(e):
 def api_exception(e):
     response_time = (time.time() - current_app.request_start_time) * 1000
     user_ip = str(request.remote_addr)
-    tb = traceback.format_exception(e)
+    tb = _format_traceback(e)
 
     _log_request(response_time)
 
@@ -21,6 +21,17 @@ class BaseConfig(object):
 
     USE_REDIS_JOBS = False
 
+    # gzip only (as before), fast level, skip bodies too small to benefit
+    # binary endpoints return raw bytes without a mimetype, hence text/html
+    COMPRESS_ALGORITHM = "gzip"
+    COMPRESS_LEVEL = 1
+    COMPRESS_MIN_SIZE = 860
+    COMPRESS_MIMETYPES = [
+        "application/json",
+        "application/octet-stream",
+        "text/html",
+    ]
+
     daf_credential_path = os.environ.get("DAF_CREDENTIALS", None)
 
     AUTH_TOKEN = None
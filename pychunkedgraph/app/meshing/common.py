@@ -62,10 +62,7 @@ def handle_get_manifest(table_id, node_id):
 
     bounding_box = None
     if "bounds" in request.args:
-        bounds = request.args["bounds"]
-        bounding_box = np.array(
-            [b.split("-") for b in bounds.split("_")], dtype=int
-        ).T
+        bounding_box = app_utils.parse_bounds(request.args["bounds"])
 
     cg = app_utils.get_cg(table_id)
     verify = request.args.get("verify", False)
@@ -1,15 +1,17 @@
 # pylint: disable=invalid-name, missing-docstring
 
-import json
+import logging
 import os
 import time
-from datetime import datetime
-from functools import reduce
+from datetime import datetime, timezone
+from functools import lru_cache
+from threading import Lock
 
 import numpy as np
+import orjson
 import pandas as pd
+from cachetools import LRUCache, TTLCache, cached
 from flask import current_app, g, jsonify, make_response, request
-from pytz import UTC
 
 from pychunkedgraph import __version__
 from pychunkedgraph.app import app_utils
@@ -49,11 +51,27 @@ def home():
     return resp
 
 
+def _get_user_id() -> str:
+    """Requesting user's id, resolved once per request."""
+    # g.auth_user is only set by the auth decorators, after before_request
+    if "user_id" not in g:
+        g.user_id = str(g.auth_user.get("id", current_app.user_id))
+    return g.user_id
+
+
 def _parse_timestamp(
     arg_name, default_timestamp=0, return_datetime=False, allow_none=False
 ):
-    """Convert seconds since epoch to UTC datetime."""
-    timestamp = request.args.get(arg_name, default_timestamp)
+    """
+    Convert seconds since epoch to UTC datetime.
+    `default_timestamp` may be a callable (e.g. `time.time`),
+    it is then only evaluated when the argument is missing.
+    """
+    timestamp = request.args.get(arg_name, None)
+    if timestamp is None:
+        if callable(default_timestamp):
+            default_timestamp = default_timestamp()
+        timestamp = default_timestamp
     if timestamp is None:
         if allow_none:
             return None
@@ -64,7 +82,7 @@ def _parse_timestamp(
     try:
         timestamp = float(timestamp)
         if return_datetime:
-            return datetime.fromtimestamp(timestamp, UTC)
+            return datetime.fromtimestamp(timestamp, timezone.utc)
         else:
             return timestamp
     except (TypeError, ValueError):
@@ -77,8 +95,7 @@ def _parse_timestamp(
 
 def _get_bounds_from_request(request):
     if "bounds" in request.args:
-        bounds = request.args["bounds"]
-        bounding_box = np.array([b.split("-") for b in bounds.split("_")], dtype=int).T
+        bounding_box = app_utils.parse_bounds(request.args["bounds"])
     else:
         bounding_box = None
     return bounding_box
@@ -96,7 +113,10 @@ def sleep_me(sleep):
     return "zzz... {} ... awake".format(sleep)
 
 
-def handle_info(table_id):
+# table metadata rarely changes, viewers request it on every load
+# cached per worker process, a meta change shows here after the ttl
+@cached(cache=TTLCache(maxsize=64, ttl=300), lock=Lock())
+def _get_info(table_id):
     cg = app_utils.get_cg(table_id)
     dataset_info = cg.meta.dataset_info
     app_info = {"app": {"supported_api_versions": list(__api_versions__)}}
@@ -110,7 +130,12 @@ def handle_info(table_id):
         combined_info["mesh_dir"] = mesh_dir
     elif combined_info.get("mesh_dir", None) is not None:
         combined_info["mesh_dir"] = "graphene_meshes"
-    return jsonify(combined_info)
+    return combined_info
+
+
+def handle_info(table_id):
+    current_app.table_id = table_id
+    return jsonify(_get_info(table_id))
 
 
 def handle_api_versions():
@@ -124,7 +149,7 @@ def handle_root(table_id, atomic_id):
     current_app.table_id = table_id
 
     # Convert seconds since epoch to UTC datetime
-    timestamp = _parse_timestamp("timestamp", time.time(), return_datetime=True)
+    timestamp = _parse_timestamp("timestamp", time.time, return_datetime=True)
 
     stop_layer = request.args.get("stop_layer", None)
     if stop_layer is not None:
@@ -150,12 +175,9 @@ def handle_roots(table_id, is_binary=False):
     current_app.request_type = "roots"
     current_app.table_id = table_id
 
-    if is_binary:
-        node_ids = np.frombuffer(request.data, np.uint64)
-    else:
-        node_ids = np.array(json.loads(request.data)["node_ids"], dtype=np.uint64)
+    node_ids = _get_request_ids("node_ids", is_binary=is_binary)
     # Convert seconds since epoch to UTC datetime
-    timestamp = _parse_timestamp("timestamp", time.time(), return_datetime=True)
+    timestamp = _parse_timestamp("timestamp", time.time, return_datetime=True)
 
     cg = app_utils.get_cg(table_id)
     stop_layer = int(request.args.get("stop_layer", cg.meta.layer_count))
@@ -181,7 +203,7 @@ def handle_l2_chunk_children(table_id, chunk_id, as_array):
     current_app.table_id = table_id
 
     # Convert seconds since epoch to UTC datetime
-    timestamp = _parse_timestamp("timestamp", time.time(), return_datetime=True)
+    timestamp = _parse_timestamp("timestamp", time.time, return_datetime=True)
 
     # Call ChunkedGraph
     cg = app_utils.get_cg(table_id)
@@ -201,34 +223,56 @@ def handle_l2_chunk_children(table_id, chunk_id, as_array):
     )
 
     if as_array:
-        l2_chunk_array = []
-
-        for l2 in rr_chunk:
-            svs = rr_chunk[l2][0].value
-            for sv in svs:
-                l2_chunk_array.extend([l2, sv])
-
-        return np.array(l2_chunk_array)
+        # flat [l2, sv, l2, sv, ...] pairs
+        l2_ids = np.fromiter(rr_chunk.keys(), dtype=basetypes.NODE_ID)
+        svs = [rr_chunk[l2][0].value for l2 in rr_chunk]
+        if len(svs) == 0:
+            return np.empty(0, dtype=basetypes.NODE_ID)
+        counts = np.fromiter((len(v) for v in svs), dtype=int, count=len(svs))
+        l2_col = np.repeat(l2_ids, counts)
+        sv_col = np.concatenate(svs).astype(basetypes.NODE_ID, copy=False)
+        return np.column_stack((l2_col, sv_col)).ravel()
     else:
         # store in dict of keys to arrays to remove reliance on bigtable
-        l2_chunk_dict = {}
-        for k in rr_chunk:
-            l2_chunk_dict[k] = rr_chunk[k][0].value
-
-        return l2_chunk_dict
+        return {k: v[0].value for k, v in rr_chunk.items()}
 
 
 def str2bool(v):
     return v.lower() in ("yes", "true", "t", "1")
 
 
+def _get_request_ids(key: str = "node_ids", is_binary: bool = False) -> np.ndarray:
+    """
+    Ids from the request body; binary bodies (`is_binary` or `?binary=1`)
+    are read as raw uint64 bytes without a copy, otherwise the body is
+    a json object with `key`.
+    """
+    is_binary = is_binary or request.args.get("binary", default=False, type=str2bool)
+    if is_binary:
+        # request.data, before_request may have replaced it with the inflated body
+        data = request.data
+        if len(data) % 8:
+            raise cg_exceptions.BadRequest(
+                f"Binary ids must be uint64, got {len(data)} bytes."
+            )
+        return np.frombuffer(data, dtype=np.uint64)
+    ids = orjson.loads(request.data)[key]
+    return np.fromiter(ids, dtype=np.uint64, count=len(ids))
+
+
+@lru_cache(maxsize=1)
+def _get_messaging_client():
+    # one client per process, reuses its connection across edits
+    from messagingclient import MessagingClient
+
+    return MessagingClient()
+
+
 def publish_edit(
     table_id: str, user_id: str, result: GraphEditOperation.Result, is_priority=True
 ):
     import pickle
 
-    from messagingclient import MessagingClient
-
     attributes = {
         "table_id": table_id,
         "user_id": user_id,
@@ -241,8 +285,21 @@ def publish_edit(
     }
 
     exchange = os.getenv("PYCHUNKEDGRAPH_EDITS_EXCHANGE", "pychunkedgraph")
-    c = MessagingClient()
-    c.publish(exchange, pickle.dumps(payload), attributes)
+    _get_messaging_client().publish(exchange, pickle.dumps(payload), attributes)
+
+
+def _parse_nodes(nodes, resolution):
+    """`[[node_id, x, y, z], ...]` to node ids and coordinates in voxels."""
+    node_ids = np.array([node[0] for node in nodes], dtype=np.uint64)
+    coords = np.array([node[1:] for node in nodes], dtype=float).reshape(-1, 3)
+    return node_ids, coords / resolution
+
+
+def _parse_split_nodes(data, resolution):
+    """Node ids and coordinates, sources first, with source and sink slices."""
+    node_ids, coords = _parse_nodes(data["sources"] + data["sinks"], resolution)
+    n_sources = len(data["sources"])
+    return node_ids, coords, slice(0, n_sources), slice(n_sources, None)
 
 
 ### MERGE ----------------------------------------------------------------------
@@ -250,9 +307,9 @@ def publish_edit(
 
 def handle_merge(table_id, allow_same_segment_merge=False):
     current_app.table_id = table_id
-    user_id = str(g.auth_user.get("id", current_app.user_id))
+    user_id = _get_user_id()
 
-    nodes = json.loads(request.data)
+    nodes = orjson.loads(request.data)
     is_priority = request.args.get("priority", True, type=str2bool)
 
     current_app.logger.debug(nodes)
@@ -260,11 +317,7 @@ def handle_merge(table_id, allow_same_segment_merge=False):
 
     # Call ChunkedGraph
     cg = app_utils.get_cg(table_id, skip_cache=True)
-    node_ids = []
-    coords = []
-    for node in nodes:
-        node_ids.append(node[0])
-        coords.append(np.array(node[1:]) / cg.segmentation_resolution)
+    node_ids, coords = _parse_nodes(nodes, cg.segmentation_resolution)
 
     atomic_edge = app_utils.handle_supervoxel_id_lookup(cg, coords, node_ids)
     # Protection from long range mergers
@@ -311,9 +364,9 @@ def handle_merge(table_id, allow_same_segment_merge=False):
 
 def handle_split(table_id):
     current_app.table_id = table_id
-    user_id = str(g.auth_user.get("id", current_app.user_id))
+    user_id = _get_user_id()
 
-    data = json.loads(request.data)
+    data = orjson.loads(request.data)
     is_priority = request.args.get("priority", True, type=str2bool)
     mincut = request.args.get("mincut", True, type=str2bool)
 
@@ -321,35 +374,22 @@ def handle_split(table_id):
 
     # Call ChunkedGraph
     cg = app_utils.get_cg(table_id, skip_cache=True)
-    node_idents = []
-    node_ident_map = {
-        "sources": 0,
-        "sinks": 1,
-    }
-    coords = []
-    node_ids = []
-
-    for k in ["sources", "sinks"]:
-        for node in data[k]:
-            node_ids.append(node[0])
-            coords.append(np.array(node[1:]) / cg.segmentation_resolution)
-            node_idents.append(node_ident_map[k])
-
-    node_ids = np.array(node_ids, dtype=np.uint64)
-    coords = np.array(coords)
-    node_idents = np.array(node_idents)
-    sv_ids = app_utils.handle_supervoxel_id_lookup(cg, coords, node_ids)
-    current_app.logger.debug(
-        {"node_id": node_ids, "sv_id": sv_ids, "node_ident": node_idents}
+    node_ids, coords, sources, sinks = _parse_split_nodes(
+        data, cg.segmentation_resolution
     )
+    sv_ids = app_utils.handle_supervoxel_id_lookup(cg, coords, node_ids)
+    if current_app.logger.isEnabledFor(logging.DEBUG):
+        current_app.logger.debug(
+            {"node_id": node_ids, "sv_id": sv_ids, "sources": sources, "sinks": sinks}
+        )
 
     try:
         ret = cg.remove_edges(
             user_id=user_id,
-            source_ids=sv_ids[node_idents == 0],
-            sink_ids=sv_ids[node_idents == 1],
-            source_coords=coords[node_idents == 0],
-            sink_coords=coords[node_idents == 1],
+            source_ids=sv_ids[sources],
+            sink_ids=sv_ids[sinks],
+            source_coords=coords[sources],
+            sink_coords=coords[sinks],
             mincut=mincut,
         )
     except cg_exceptions.LockingError as e:
@@ -378,9 +418,9 @@ def handle_split(table_id):
 def handle_undo(table_id):
     current_app.table_id = table_id
 
-    data = json.loads(request.data)
+    data = orjson.loads(request.data)
     is_priority = request.args.get("priority", True, type=str2bool)
-    user_id = str(g.auth_user.get("id", current_app.user_id))
+    user_id = _get_user_id()
 
     current_app.logger.debug(data)
 
@@ -410,9 +450,9 @@ def handle_undo(table_id):
 def handle_redo(table_id):
     current_app.table_id = table_id
 
-    data = json.loads(request.data)
+    data = orjson.loads(request.data)
     is_priority = request.args.get("priority", True, type=str2bool)
-    user_id = str(g.auth_user.get("id", current_app.user_id))
+    user_id = _get_user_id()
 
     current_app.logger.debug(data)
 
@@ -442,25 +482,24 @@ def handle_redo(table_id):
 def handle_rollback(table_id):
     current_app.table_id = table_id
 
-    user_id = str(g.auth_user.get("id", current_app.user_id))
+    user_id = _get_user_id()
     target_user_id = request.args["user_id"]
 
     is_priority = request.args.get("priority", True, type=str2bool)
-    skip_operation_ids = np.array(
-        json.loads(request.args.get("skip_operation_ids", "[]")), dtype=np.uint64
+    skip_operation_ids = set(
+        int(x) for x in orjson.loads(request.args.get("skip_operation_ids", "[]"))
     )
 
     # Call ChunkedGraph
     cg = app_utils.get_cg(table_id)
     user_operations = all_user_operations(table_id)
-    operation_ids = user_operations["operation_id"]
-    timestamps = user_operations["timestamp"]
-    operations = list(zip(operation_ids, timestamps))
-    operations.sort(key=lambda op: op[1], reverse=True)
-
-    for operation in operations:
-        operation_id = operation[0]
-        if operation_id in skip_operation_ids:
+    operation_ids = np.asarray(user_operations["operation_id"])
+    timestamps = np.asarray(user_operations["timestamp"], dtype=object)
+    # undo latest first
+    order = np.argsort(timestamps, kind="stable")[::-1]
+
+    for operation_id in operation_ids[order]:
+        if int(operation_id) in skip_operation_ids:
             continue
         try:
             ret = cg.undo_operation(user_id=target_user_id, operation_id=operation_id)
@@ -494,11 +533,11 @@ def all_user_operations(
     # If include_errored is false, it will not include operations that failed with
     # an error.
     current_app.table_id = table_id
-    user_id = str(g.auth_user.get("id", current_app.user_id))
+    user_id = _get_user_id()
     target_user_id = request.args.get("user_id", None)
 
     start_time = _parse_timestamp("start_time", 0, return_datetime=True)
-    end_time = _parse_timestamp("end_time", datetime.utcnow(), return_datetime=True)
+    end_time = _parse_timestamp("end_time", time.time, return_datetime=True)
     # Call ChunkedGraph
     cg = app_utils.get_cg(table_id)
 
@@ -508,7 +547,9 @@ def all_user_operations(
 
     valid_entry_ids = []
     timestamp_list = []
-    undone_ids = np.array([])
+    # valid entries that are undo/redo operations themselves
+    undo_redo_ids = set()
+    undone_ids = set()
 
     entry_ids = np.sort(list(log_rows.keys()))
     for entry_id in entry_ids:
@@ -527,47 +568,38 @@ def all_user_operations(
             or (len(entry[OperationLogs.RootID]) > 1)
         )
         if not split_valid:
-            print("excluding partial split", entry_id)
+            current_app.logger.debug("excluding partial split %s", entry_id)
         error_valid = include_errored or should_check
         if not error_valid:
-            print("excluding errored", entry_id)
+            current_app.logger.debug("excluding errored %s", entry_id)
+        is_undo = OperationLogs.UndoOperationID in entry
+        is_redo = OperationLogs.RedoOperationID in entry
         if user_id == target_user_id and split_valid and error_valid:
             valid_entry_ids.append(entry_id)
-            timestamp = entry["timestamp"]
-            timestamp_list.append(timestamp)
+            timestamp_list.append(entry["timestamp"])
+            if is_undo or is_redo:
+                undo_redo_ids.add(int(entry_id))
 
         if should_check:
             # if it is an undo of another operation, mark it as undone
-            if OperationLogs.UndoOperationID in entry:
-                undone_id = entry[OperationLogs.UndoOperationID]
-                undone_ids = np.append(undone_ids, undone_id)
+            if is_undo:
+                undone_ids.add(int(entry[OperationLogs.UndoOperationID]))
 
             # if it is a redo of another operation, unmark it as undone
-            if OperationLogs.RedoOperationID in entry:
-                redone_id = entry[OperationLogs.RedoOperationID]
-                undone_ids = np.delete(undone_ids, np.argwhere(undone_ids == redone_id))
+            if is_redo:
+                undone_ids.discard(int(entry[OperationLogs.RedoOperationID]))
 
     if include_undone:
         return {"operation_id": valid_entry_ids, "timestamp": timestamp_list}
 
-    filtered_entry_ids = []
-    filtered_timestamp_list = []
-    for i in range(len(valid_entry_ids)):
-        entry_id = valid_entry_ids[i]
-        entry = log_rows[entry_id]
-
-        if (
-            OperationLogs.UndoOperationID in entry
-            or OperationLogs.RedoOperationID in entry
-        ):
-            continue
-
-        undone = entry_id in undone_ids
-        if not undone:
-            filtered_entry_ids.append(entry_id)
-            timestamp = entry["timestamp"]
-            filtered_timestamp_list.append(timestamp)
-
+    excluded = undone_ids | undo_redo_ids
+    filtered = [
+        (entry_id, timestamp)
+        for entry_id, timestamp in zip(valid_entry_ids, timestamp_list)
+        if int(entry_id) not in excluded
+    ]
+    filtered_entry_ids = [entry_id for entry_id, _ in filtered]
+    filtered_timestamp_list = [timestamp for _, timestamp in filtered]
     return {"operation_id": filtered_entry_ids, "timestamp": filtered_timestamp_list}
 
 
@@ -576,7 +608,7 @@ def all_user_operations(
 
 def handle_children(table_id, parent_id):
     current_app.table_id = table_id
-    user_id = str(g.auth_user.get("id", current_app.user_id))
+    user_id = _get_user_id()
 
     cg = app_utils.get_cg(table_id)
 
@@ -596,7 +628,7 @@ def handle_children(table_id, parent_id):
 
 def handle_leaves(table_id, root_id):
     current_app.table_id = table_id
-    user_id = str(g.auth_user.get("id", current_app.user_id))
+    user_id = _get_user_id()
 
     stop_layer = int(request.args.get("stop_layer", 1))
    
@@ -625,11 +657,11 @@ def handle_leaves(table_id, root_id):
 
 def handle_leaves_many(table_id):
     current_app.table_id = table_id
-    user_id = str(g.auth_user.get("id", current_app.user_id))
+    user_id = _get_user_id()
 
     bounding_box = _get_bounds_from_request(request)
 
-    node_ids = np.array(json.loads(request.data)["node_ids"], dtype=np.uint64)
+    node_ids = _get_request_ids("node_ids")
     stop_layer = int(request.args.get("stop_layer", 1))
 
     # Call ChunkedGraph
@@ -652,7 +684,7 @@ def handle_leaves_many(table_id):
 
 def handle_leaves_from_leave(table_id, atomic_id):
     current_app.table_id = table_id
-    user_id = str(g.auth_user.get("id", current_app.user_id))
+    user_id = _get_user_id()
 
     bounding_box = _get_bounds_from_request(request)
 
@@ -664,15 +696,32 @@ def handle_leaves_from_leave(table_id, atomic_id):
         root_id, bbox=bounding_box, bbox_is_coordinate=True, nodes_only=True
     )
 
-    return np.concatenate([np.array([root_id]), atomic_ids])
+    # root first, one allocation and a single copy of the leaves
+    result = np.empty(atomic_ids.size + 1, dtype=basetypes.NODE_ID)
+    result[0] = root_id
+    result[1:] = atomic_ids
+    return result
 
 
 ### SUBGRAPH -------------------------------------------------------------------
 
 
+def _isin_sorted(values: np.ndarray, sorted_keys: np.ndarray) -> np.ndarray:
+    """`np.isin` against keys that are already sorted."""
+    if sorted_keys.size == 0:
+        return np.zeros(values.shape, dtype=bool)
+    key_range = int(sorted_keys[-1]) - int(sorted_keys[0])
+    if key_range <= 4 * (values.size + sorted_keys.size):
+        # dense keys, e.g. supervoxels of a single chunk: linear lookup table
+        return np.isin(values, sorted_keys, kind="table")
+    idx = np.searchsorted(sorted_keys, values)
+    idx[idx == sorted_keys.size] = 0
+    return sorted_keys[idx] == values
+
+
 def handle_subgraph(table_id, root_id):
     current_app.table_id = table_id
-    user_id = str(g.auth_user.get("id", current_app.user_id))
+    user_id = _get_user_id()
 
     bounding_box = _get_bounds_from_request(request)
 
@@ -683,12 +732,12 @@ def handle_subgraph(table_id, root_id):
         bbox=bounding_box,
         bbox_is_coordinate=True,
     )
-    edges = reduce(lambda x, y: x + y, edges, cg_edges.Edges([], []))
-    supervoxels = np.concatenate(
-        [agg.supervoxels for agg in l2id_agglomeration_d.values()]
+    edges = cg_edges.Edges.concatenate(edges)
+    supervoxels = np.sort(
+        np.concatenate([agg.supervoxels for agg in l2id_agglomeration_d.values()])
     )
-    mask0 = np.in1d(edges.node_ids1, supervoxels)
-    mask1 = np.in1d(edges.node_ids2, supervoxels)
+    mask0 = _isin_sorted(edges.node_ids1, supervoxels)
+    mask1 = _isin_sorted(edges.node_ids2, supervoxels)
     edges = edges[mask0 & mask1]
 
     return edges
@@ -699,7 +748,7 @@ def handle_subgraph(table_id, root_id):
 
 def change_log(table_id, root_id=None, filtered=False):
     current_app.table_id = table_id
-    user_id = str(g.auth_user.get("id", current_app.user_id))
+    user_id = _get_user_id()
     time_stamp_past = _parse_timestamp("timestamp", 0, return_datetime=True)
 
     cg = app_utils.get_cg(table_id)
@@ -713,7 +762,7 @@ def change_log(table_id, root_id=None, filtered=False):
 
 def tabular_change_log_recent(table_id):
     current_app.table_id = table_id
-    user_id = str(g.auth_user.get("id", current_app.user_id))
+    user_id = _get_user_id()
 
     start_time = _parse_timestamp("timestamp", 0, return_datetime=True)
     end_time = (
@@ -758,7 +807,7 @@ def tabular_change_logs(table_id, root_ids, filtered=False):
     current_app.request_type = "tabular_changelog_many"
 
     current_app.table_id = table_id
-    user_id = str(g.auth_user.get("id", current_app.user_id))
+    user_id = _get_user_id()
 
     # Call ChunkedGraph
     cg = app_utils.get_cg(table_id)
@@ -771,32 +820,24 @@ def tabular_change_logs(table_id, root_ids, filtered=False):
     else:
         tab = history.tabular_changelogs
 
-    all_user_ids = []
-    for tab_k in tab.keys():
-        all_user_ids.extend(np.array(tab[tab_k]["user_id"]).reshape(-1))
-
-    all_user_ids = []
-    for tab_k in tab.keys():
-        all_user_ids.extend(np.array(tab[tab_k]["user_id"]).reshape(-1))
-
-    all_user_ids = np.unique(all_user_ids)
-
-    if len(all_user_ids) == 0:
+    tab_user_ids = {
+        tab_k: np.asarray(tab[tab_k]["user_id"]).reshape(-1) for tab_k in tab.keys()
+    }
+    if sum(ids.size for ids in tab_user_ids.values()) == 0:
         return tab
 
+    all_user_ids = np.unique(np.concatenate(list(tab_user_ids.values())))
     user_name_dict, user_aff_dict = app_utils.get_userinfo_dict(
         all_user_ids, current_app.config["AUTH_TOKEN"]
     )
 
-    for tab_k in tab.keys():
-        user_names = [
-            user_name_dict.get(int(id_), "unknown")
-            for id_ in np.array(tab[tab_k]["user_id"])
-        ]
-        user_affs = [
-            user_aff_dict.get(int(id_), "unknown")
-            for id_ in np.array(tab[tab_k]["user_id"])
-        ]
+    for tab_k, ids in tab_user_ids.items():
+        # lookups once per unique id, then broadcast back
+        unique_ids, inverse = np.unique(ids, return_inverse=True)
+        names = [user_name_dict.get(int(id_), "unknown") for id_ in unique_ids]
+        affs = [user_aff_dict.get(int(id_), "unknown") for id_ in unique_ids]
+        user_names = np.array(names, dtype=object)[inverse].tolist()
+        user_affs = np.array(affs, dtype=object)[inverse].tolist()
         tab[tab_k]["user_name"] = user_names
         tab[tab_k]["user_affiliation"] = user_affs
     return tab
@@ -804,7 +845,7 @@ def tabular_change_logs(table_id, root_ids, filtered=False):
 
 def merge_log(table_id, root_id):
     current_app.table_id = table_id
-    user_id = str(g.auth_user.get("id", current_app.user_id))
+    user_id = _get_user_id()
 
     # Call ChunkedGraph
     cg = app_utils.get_cg(table_id)
@@ -818,16 +859,16 @@ def handle_lineage_graph(table_id, root_id=None):
     from pychunkedgraph.graph.lineage import lineage_graph
 
     current_app.table_id = table_id
-    user_id = str(g.auth_user.get("id", current_app.user_id))
+    user_id = _get_user_id()
 
     timestamp_past = _parse_timestamp("timestamp_past", 0, return_datetime=True)
     timestamp_future = _parse_timestamp(
-        "timestamp_future", time.time(), return_datetime=True
+        "timestamp_future", time.time, return_datetime=True
     )
 
     cg = app_utils.get_cg(table_id)
     if root_id is None:
-        root_ids = np.array(json.loads(request.data)["root_ids"], dtype=np.uint64)
+        root_ids = _get_request_ids("root_ids")
         graph = lineage_graph(cg, root_ids, timestamp_past, timestamp_future)
         return node_link_data(graph)
     history_ids = segmenthistory.SegmentHistory(
@@ -837,12 +878,12 @@ def handle_lineage_graph(table_id, root_id=None):
 
 
 def handle_past_id_mapping(table_id):
-    root_ids = np.array(json.loads(request.data)["root_ids"], dtype=np.uint64)
+    root_ids = _get_request_ids("root_ids")
     timestamp_past = _parse_timestamp(
         "timestamp_past", default_timestamp=0, return_datetime=True
     )
     timestamp_future = _parse_timestamp(
-        "timestamp_future", default_timestamp=time.time(), return_datetime=True
+        "timestamp_future", default_timestamp=time.time, return_datetime=True
     )
 
     cg = app_utils.get_cg(table_id)
@@ -850,30 +891,36 @@ def handle_past_id_mapping(table_id):
         cg, root_ids, timestamp_past=timestamp_past, timestamp_future=timestamp_future
     )
     past_id_mapping, future_id_mapping = hist.past_future_id_mapping()
+    # int keys are written as strings by both json encoders
     return {
-        "past_id_map": {str(k): past_id_mapping[k] for k in past_id_mapping.keys()},
-        "future_id_map": {
-            str(k): future_id_mapping[k] for k in future_id_mapping.keys()
-        },
+        "past_id_map": past_id_mapping,
+        "future_id_map": dict(
+            zip(map(int, future_id_mapping), future_id_mapping.values())
+        ),
     }
 
 
 def last_edit(table_id, root_id):
     current_app.table_id = table_id
-    user_id = str(g.auth_user.get("id", current_app.user_id))
+    user_id = _get_user_id()
 
     cg = app_utils.get_cg(table_id)
     hist = segmenthistory.SegmentHistory(cg, int(root_id))
     return hist.last_edit_timestamp(int(root_id))
 
 
-def oldest_timestamp(table_id):
-    current_app.table_id = table_id
-    user_id = str(g.auth_user.get("id", current_app.user_id))
+@cached(cache=TTLCache(maxsize=64, ttl=300), lock=Lock())
+def _get_oldest_timestamp(table_id):
     cg = app_utils.get_cg(table_id)
     return cg.get_earliest_timestamp()
 
 
+def oldest_timestamp(table_id):
+    current_app.table_id = table_id
+    user_id = _get_user_id()
+    return _get_oldest_timestamp(table_id)
+
+
 ### CONTACT SITES --------------------------------------------------------------
 
 
@@ -881,9 +928,9 @@ def handle_contact_sites(table_id, root_id):
     partners = request.args.get("partners", True, type=app_utils.toboolean)
 
     current_app.table_id = table_id
-    user_id = str(g.auth_user.get("id", current_app.user_id))
+    user_id = _get_user_id()
 
-    timestamp = _parse_timestamp("timestamp", time.time(), return_datetime=True)
+    timestamp = _parse_timestamp("timestamp", time.time, return_datetime=True)
 
     bounding_box = _get_bounds_from_request(request)
 
@@ -904,9 +951,9 @@ def handle_contact_sites(table_id, root_id):
 def handle_pairwise_contact_sites(table_id, first_node_id, second_node_id):
     current_app.request_type = "pairwise_contact_sites"
     current_app.table_id = table_id
-    user_id = str(g.auth_user.get("id", current_app.user_id))
+    user_id = _get_user_id()
 
-    timestamp = _parse_timestamp("timestamp", time.time(), return_datetime=True)
+    timestamp = _parse_timestamp("timestamp", time.time, return_datetime=True)
 
     exact_location = request.args.get("exact_location", True, type=app_utils.toboolean)
     cg = app_utils.get_cg(table_id)
@@ -925,41 +972,28 @@ def handle_pairwise_contact_sites(table_id, first_node_id, second_node_id):
 
 def handle_split_preview(table_id):
     current_app.table_id = table_id
-    user_id = str(g.auth_user.get("id", current_app.user_id))
+    user_id = _get_user_id()
 
-    data = json.loads(request.data)
+    data = orjson.loads(request.data)
     current_app.logger.debug(data)
 
     cg = app_utils.get_cg(table_id)
-    node_idents = []
-    node_ident_map = {
-        "sources": 0,
-        "sinks": 1,
-    }
-    coords = []
-    node_ids = []
-
-    for k in ["sources", "sinks"]:
-        for node in data[k]:
-            node_ids.append(node[0])
-            coords.append(np.array(node[1:]) / cg.segmentation_resolution)
-            node_idents.append(node_ident_map[k])
-
-    node_ids = np.array(node_ids, dtype=np.uint64)
-    coords = np.array(coords)
-    node_idents = np.array(node_idents)
-    sv_ids = app_utils.handle_supervoxel_id_lookup(cg, coords, node_ids)
-    current_app.logger.debug(
-        {"node_id": node_ids, "sv_id": sv_ids, "node_ident": node_idents}
+    node_ids, coords, sources, sinks = _parse_split_nodes(
+        data, cg.segmentation_resolution
     )
+    sv_ids = app_utils.handle_supervoxel_id_lookup(cg, coords, node_ids)
+    if current_app.logger.isEnabledFor(logging.DEBUG):
+        current_app.logger.debug(
+            {"node_id": node_ids, "sv_id": sv_ids, "sources": sources, "sinks": sinks}
+        )
 
     try:
         supervoxel_ccs, illegal_split = cutting.run_split_preview(
             cg=cg,
-            source_ids=sv_ids[node_idents == 0],
-            sink_ids=sv_ids[node_idents == 1],
-            source_coords=coords[node_idents == 0],
-            sink_coords=coords[node_idents == 1],
+            source_ids=sv_ids[sources],
+            sink_ids=sv_ids[sinks],
+            source_coords=coords[sources],
+            sink_coords=coords[sinks],
             bb_offset=(240, 240, 24),
         )
     except cg_exceptions.PreconditionError as e:
@@ -977,19 +1011,15 @@ def handle_split_preview(table_id):
 
 def handle_find_path(table_id, precision_mode):
     current_app.table_id = table_id
-    user_id = str(g.auth_user.get("id", current_app.user_id))
+    user_id = _get_user_id()
 
-    nodes = json.loads(request.data)
+    nodes = orjson.loads(request.data)
     current_app.logger.debug(nodes)
     assert len(nodes) == 2
 
     # Call ChunkedGraph
     cg = app_utils.get_cg(table_id)
-    node_ids = []
-    coords = []
-    for node in nodes:
-        node_ids.append(node[0])
-        coords.append(np.array(node[1:]) / cg.segmentation_resolution)
+    node_ids, coords = _parse_nodes(nodes, cg.segmentation_resolution)
 
     if len(coords) != 2:
         cg_exceptions.BadRequest("Merge needs two nodes.")
@@ -997,12 +1027,13 @@ def handle_find_path(table_id, precision_mode):
         cg, coords, node_ids
     )
 
-    source_l2_id = cg.get_parent(source_supervoxel_id)
-    target_l2_id = cg.get_parent(target_supervoxel_id)
+    source_l2_id, target_l2_id = cg.get_parents(
+        np.array([source_supervoxel_id, target_supervoxel_id], dtype=np.uint64)
+    )
 
-    print("Finding path...")
-    print(f"Source: {source_supervoxel_id}")
-    print(f"Target: {target_supervoxel_id}")
+    current_app.logger.debug(
+        "Finding path from %s to %s", source_supervoxel_id, target_supervoxel_id
+    )
 
     root_time_stamp = cg.get_node_timestamps(
         [np.uint64(nodes[0][0])], return_numpy=False
@@ -1010,13 +1041,13 @@ def handle_find_path(table_id, precision_mode):
     l2_path = pathing.find_l2_shortest_path(
         cg, source_l2_id, target_l2_id, time_stamp=root_time_stamp
     )
-    print(f"Path: {l2_path}")
+    current_app.logger.debug("Path: %s", l2_path)
     if precision_mode:
         centroids, failed_l2_ids = mesh_analysis.compute_mesh_centroids_of_l2_ids(
             cg, l2_path, flatten=True
         )
-        print(f"Centroids: {centroids}")
-        print(f"Failed L2 ids: {failed_l2_ids}")
+        current_app.logger.debug("Centroids: %s", centroids)
+        current_app.logger.debug("Failed L2 ids: %s", failed_l2_ids)
         return {
             "centroids_list": centroids,
             "failed_l2_ids": failed_l2_ids,
@@ -1024,21 +1055,43 @@ def handle_find_path(table_id, precision_mode):
         }
     else:
         centroids = pathing.compute_rough_coordinate_path(cg, l2_path)
-        print(f"Centroids: {centroids}")
+        current_app.logger.debug("Centroids: %s", centroids)
         return {"centroids_list": centroids, "failed_l2_ids": [], "l2_path": l2_path}
 
 
 ### GET_LAYER2_SUBGRAPH
+# node ids are never reused and their l2 subgraph does not change,
+# edits create new ids, so entries need no invalidation
+LVL2_GRAPH_CACHE_SIZE = int(os.environ.get("LVL2_GRAPH_CACHE_SIZE", 64))
+_LVL2_GRAPH_CACHE = LRUCache(maxsize=LVL2_GRAPH_CACHE_SIZE)
+_LVL2_GRAPH_CACHE_LOCK = Lock()
+
+
+def _get_lvl2_edge_list(table_id, node_id, bounding_box):
+    bounds_key = None if bounding_box is None else bounding_box.tobytes()
+    key = (table_id, node_id, bounds_key)
+    with _LVL2_GRAPH_CACHE_LOCK:
+        edge_graph = _LVL2_GRAPH_CACHE.get(key)
+    if edge_graph is not None:
+        return edge_graph
+
+    cg = app_utils.get_cg(table_id)
+    current_app.logger.debug("Finding edge graph...")
+    edge_graph = pathing.get_lvl2_edge_list(cg, node_id, bbox=bounding_box)
+    current_app.logger.debug("Edge graph found len: %s", len(edge_graph))
+    # shared between requests
+    edge_graph.setflags(write=False)
+    with _LVL2_GRAPH_CACHE_LOCK:
+        _LVL2_GRAPH_CACHE[key] = edge_graph
+    return edge_graph
+
+
 def handle_get_layer2_graph(table_id, node_id):
     current_app.table_id = table_id
-    user_id = str(g.auth_user.get("id", current_app.user_id))
+    user_id = _get_user_id()
 
     bounding_box = _get_bounds_from_request(request)
-
-    cg = app_utils.get_cg(table_id)
-    print("Finding edge graph...")
-    edge_graph = pathing.get_lvl2_edge_list(cg, int(node_id), bbox=bounding_box)
-    print("Edge graph found len: {}".format(len(edge_graph)))
+    edge_graph = _get_lvl2_edge_list(table_id, int(node_id), bounding_box)
     return {"edge_graph": edge_graph}
 
 
@@ -1049,12 +1102,9 @@ def handle_is_latest_roots(table_id, is_binary):
     current_app.request_type = "is_latest_roots"
     current_app.table_id = table_id
 
-    if is_binary:
-        node_ids = np.frombuffer(request.data, np.uint64)
-    else:
-        node_ids = np.array(json.loads(request.data)["node_ids"], dtype=np.uint64)
+    node_ids = _get_request_ids("node_ids", is_binary=is_binary)
     # Convert seconds since epoch to UTC datetime
-    timestamp = _parse_timestamp("timestamp", time.time(), return_datetime=True)
+    timestamp = _parse_timestamp("timestamp", time.time, return_datetime=True)
 
     # Call ChunkedGraph
     cg = app_utils.get_cg(table_id)
@@ -1066,10 +1116,7 @@ def handle_root_timestamps(table_id, is_binary):
     current_app.request_type = "root_timestamps"
     current_app.table_id = table_id
 
-    if is_binary:
-        node_ids = np.frombuffer(request.data, np.uint64)
-    else:
-        node_ids = np.array(json.loads(request.data)["node_ids"], dtype=np.uint64)
+    node_ids = _get_request_ids("node_ids", is_binary=is_binary)
 
     # Call ChunkedGraph
     cg = app_utils.get_cg(table_id)
@@ -1081,12 +1128,18 @@ def handle_root_timestamps(table_id, is_binary):
 ### OPERATION DETAILS ------------------------------------------------------------
 
 
-def operation_details(table_id):
-    from pychunkedgraph.export.operation_logs import parse_attr
+# column name lookup for log entries, avoids decoding keys per cell
+_LOG_ATTR_NAMES = {attr: attr.key.decode("utf-8") for attr in OperationLogs.all()}
 
+
+def operation_details(table_id):
     current_app.table_id = table_id
-    user_id = str(g.auth_user.get("id", current_app.user_id))
-    operation_ids = json.loads(request.args.get("operation_ids", "[]"))
+    user_id = _get_user_id()
+    operation_ids = orjson.loads(request.args.get("operation_ids", "[]"))
+    # optional comma separated subset of attributes to return
+    fields = request.args.get("fields", None)
+    if fields is not None:
+        fields = set(field.strip() for field in fields.split(","))
 
     cg = app_utils.get_cg(table_id)
     log_rows = cg.client.read_log_entries(operation_ids)
@@ -1095,11 +1148,14 @@ def operation_details(table_id):
     for k, v in log_rows.items():
         details = {}
         for _k, _v in v.items():
-            _k, _v = parse_attr(_k, _v)
-            try:
-                details[_k.decode("utf-8")] = _v
-            except AttributeError:
-                details[_k] = _v
+            name = _LOG_ATTR_NAMES.get(_k, _k)
+            if fields is not None and name not in fields:
+                continue
+            if isinstance(_v, OperationLogs.StatusCodes):
+                _v = _v.value
+            elif isinstance(_v, np.ndarray):
+                _v = _v.tolist()
+            details[name] = _v
         result[int(k)] = details
     return result
 
@@ -1112,7 +1168,7 @@ def delta_roots(table_id):
 
     timestamp_past = _parse_timestamp("timestamp_past", None, return_datetime=True)
     timestamp_future = _parse_timestamp(
-        "timestamp_future", time.time(), return_datetime=True
+        "timestamp_future", time.time, return_datetime=True
     )
     cg = app_utils.get_cg(table_id)
     old_roots, new_roots = cg.get_proofread_root_ids(timestamp_past, timestamp_future)
@@ -1126,10 +1182,7 @@ def valid_nodes(table_id, is_binary):
     current_app.request_type = "valid_nodes"
     current_app.table_id = table_id
 
-    if is_binary:
-        node_ids = np.frombuffer(request.data, np.uint64)
-    else:
-        node_ids = np.array(json.loads(request.data)["node_ids"], dtype=np.uint64)
+    node_ids = _get_request_ids("node_ids", is_binary=is_binary)
 
     # Convert seconds since epoch to UTC datetime
     end_timestamp = _parse_timestamp(
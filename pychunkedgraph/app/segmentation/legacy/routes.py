@@ -130,7 +130,7 @@ def handle_root_2(table_id, atomic_id):
 @auth_requires_permission("view")
 def handle_children(table_id, parent_id):
     children_ids = common.handle_children(table_id, parent_id)
-    return app_utils.tobinary(children_ids)
+    return app_utils.tobinary_response(children_ids)
 
 
 ### LEAVES ---------------------------------------------------------------------
@@ -140,7 +140,7 @@ def handle_children(table_id, parent_id):
 @auth_requires_permission("view")
 def handle_leaves(table_id, root_id):
     leaf_ids = common.handle_leaves(table_id, root_id)
-    return app_utils.tobinary(leaf_ids)
+    return app_utils.tobinary_response(leaf_ids)
 
 
 ### LEAVES FROM LEAVES ---------------------------------------------------------
@@ -150,7 +150,7 @@ def handle_leaves(table_id, root_id):
 @auth_requires_permission("view")
 def handle_leaves_from_leave(table_id, atomic_id):
     leaf_ids = common.handle_leaves_from_leave(table_id, atomic_id)
-    return app_utils.tobinary(leaf_ids)
+    return app_utils.tobinary_response(leaf_ids)
 
 
 ### SUBGRAPH -------------------------------------------------------------------
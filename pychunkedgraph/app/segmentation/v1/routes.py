@@ -2,10 +2,10 @@
 
 import csv
 import io
-import json
 import pickle
 
 import numpy as np
+import orjson
 import pandas as pd
 from flask import Blueprint, make_response, request
 from middle_auth_client import (
@@ -16,9 +16,12 @@ from middle_auth_client import (
 
 from pychunkedgraph.app import common as app_common
 from pychunkedgraph.app.app_utils import (
+    jsonify_bytes_body,
     jsonify_with_kwargs,
     remap_public,
     tobinary,
+    tobinary_id_mapping,
+    tobinary_response,
     toboolean,
 )
 from pychunkedgraph.app.segmentation import common
@@ -222,7 +225,7 @@ def handle_roots(table_id):
 
     arg_as_binary = request.args.get("as_binary", default="", type=str)
     if arg_as_binary in resp:
-        return tobinary(resp[arg_as_binary])
+        return tobinary_response(resp[arg_as_binary])
     else:
         return jsonify_with_kwargs(resp, int64_as_str=int64_as_str)
 
@@ -235,7 +238,7 @@ def handle_roots(table_id):
 @remap_public(edit=False)
 def handle_roots_binary(table_id):
     root_ids = common.handle_roots(table_id, is_binary=True)
-    return tobinary(root_ids)
+    return tobinary_response(root_ids)
 
 
 ### CHILDREN -------------------------------------------------------------------
@@ -278,7 +281,7 @@ def handle_l2_chunk_children_binary(table_id, chunk_id):
     as_array = request.args.get("as_array", default=False, type=toboolean)
     l2_chunk_children = common.handle_l2_chunk_children(table_id, chunk_id, as_array)
     if as_array:
-        return tobinary(l2_chunk_children)
+        return tobinary_response(l2_chunk_children)
     else:
         return pickle.dumps(l2_chunk_children)
 
@@ -296,6 +299,10 @@ def handle_l2_chunk_children_binary(table_id, chunk_id):
 def handle_leaves(table_id, node_id):
     int64_as_str = request.args.get("int64_as_str", default=False, type=toboolean)
     leaf_ids = common.handle_leaves(table_id, node_id)
+    if int64_as_str is False:
+        leaf_ids = np.ascontiguousarray(leaf_ids)
+        body = orjson.dumps(leaf_ids, option=orjson.OPT_SERIALIZE_NUMPY)
+        return jsonify_bytes_body(body, envelope_key="leaf_ids")
     resp = {"leaf_ids": leaf_ids}
     return jsonify_with_kwargs(resp, int64_as_str=int64_as_str)
 
@@ -314,6 +321,9 @@ def handle_leaves(table_id, node_id):
 def handle_leaves_many(table_id):
     int64_as_str = request.args.get("int64_as_str", default=False, type=toboolean)
     root_to_leaf_dict = common.handle_leaves_many(table_id)
+    # ?binary is for the request body, the response format is chosen separately
+    if request.args.get("binary_output", default=False, type=toboolean):
+        return tobinary_id_mapping(root_to_leaf_dict)
     return jsonify_with_kwargs(root_to_leaf_dict, int64_as_str=int64_as_str)
 
 
@@ -430,7 +440,7 @@ def tabular_change_log(table_id, root_id):
 @remap_public(edit=False)
 def tabular_change_log_many(table_id):
     filtered = request.args.get("filtered", default=True, type=toboolean)
-    root_ids = np.array(json.loads(request.data)["root_ids"], dtype=np.uint64)
+    root_ids = np.array(orjson.loads(request.data)["root_ids"], dtype=np.uint64)
     tab_change_log_dict = common.tabular_change_logs(table_id, root_ids, filtered)
 
     return jsonify_with_kwargs(
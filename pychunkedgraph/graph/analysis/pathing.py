@@ -179,6 +179,9 @@ def find_l2_shortest_path(
     :param target_l2_id: np.uint64
     :return: [np.uint64] or None
     """
+    if source_l2_id == target_l2_id:
+        return np.array([source_l2_id], dtype=np.uint64)
+
     # Get the cross-chunk edges that we need to build the graph
     shared_parent_id = get_first_shared_parent(
         cg, source_l2_id, target_l2_id, time_stamp
@@ -193,10 +196,13 @@ def find_l2_shortest_path(
     )
 
     # Find the shortest path from the source_l2_id to the target_l2_id
-    source_graph_id = np.where(graph_indexed_l2_ids == source_l2_id)[0][0]
-    target_graph_id = np.where(graph_indexed_l2_ids == target_l2_id)[0][0]
+    # graph_indexed_l2_ids is sorted (np.unique), no need to scan it
+    source_graph_id, target_graph_id = np.searchsorted(
+        graph_indexed_l2_ids, np.array([source_l2_id, target_l2_id], dtype=np.uint64)
+    )
     source_vertex = weighted_graph.vertex(source_graph_id)
     target_vertex = weighted_graph.vertex(target_graph_id)
+    # no weights, graph-tool runs a BFS and stops once the target is reached
     vertex_list, _ = graph_tool.topology.shortest_path(
         weighted_graph, source=source_vertex, target=target_vertex
     )
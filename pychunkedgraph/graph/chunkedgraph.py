@@ -125,6 +125,46 @@ class ChunkedGraph:
             end_time_inclusive=True,
         )
 
+    def range_read_chunks(
+        self,
+        chunk_ids: typing.Sequence[basetypes.CHUNK_ID],
+        properties: typing.Optional[
+            typing.Union[typing.Iterable[attributes._Attribute], attributes._Attribute]
+        ] = None,
+        time_stamp: typing.Optional[datetime.datetime] = None,
+    ) -> typing.Dict:
+        """
+        Read all nodes in multiple chunks with one multi range request.
+        Returns {chunk_id: {node_id: data}}, per chunk the same as `range_read_chunk`.
+        """
+        result = {chunk_id: {} for chunk_id in chunk_ids}
+        if not result:
+            return result
+        id_ranges = []
+        for chunk_id in chunk_ids:
+            chunk_id = np.uint64(chunk_id)
+            # full segment id range of the chunk, no ids exist beyond the counter
+            # so this avoids reading the id counter(s) of every chunk first
+            id_ranges.append(
+                (
+                    self.get_node_id(np.uint64(0), chunk_id=chunk_id),
+                    chunk_id | self.get_segment_id_limit(chunk_id),
+                )
+            )
+        rows = self.client.read_nodes(
+            id_ranges=id_ranges,
+            properties=properties,
+            end_time=time_stamp,
+            end_time_inclusive=True,
+        )
+        if not rows:
+            return result
+        node_ids = np.fromiter(rows.keys(), dtype=basetypes.NODE_ID, count=len(rows))
+        node_chunk_ids = self.get_chunk_ids_from_node_ids(node_ids)
+        for (node_id, data), chunk_id in zip(rows.items(), node_chunk_ids):
+            result[chunk_id][node_id] = data
+        return result
+
     def get_atomic_id_from_coord(
         self,
         x: int,
@@ -162,7 +202,7 @@ class ChunkedGraph:
         :return: supervoxel ids; returns None if no solution was found
         """
         if self.get_chunk_layer(parent_id) == 1:
-            return np.array([parent_id] * len(coordinates), dtype=np.uint64)
+            return np.full(len(coordinates), parent_id, dtype=np.uint64)
 
         # Enable search with old parent by using its timestamp and map to parents
         parent_ts = self.get_node_timestamps([parent_id], return_numpy=False)[0]
@@ -55,12 +55,10 @@ def get_chunk_layers(meta, node_or_chunk_ids: Sequence[np.uint64]) -> np.ndarray
     if len(node_or_chunk_ids) == 0:
         return np.array([], dtype=int)
 
-    layers = np.array(node_or_chunk_ids, dtype=int)
-
-    layers1 = layers >> (64 - meta.graph_config.LAYER_ID_BITS)
-    # layers2 = np.vectorize(get_chunk_layer)(meta, node_or_chunk_ids)
-    # assert np.all(layers1 == layers2)
-    return layers1
+    # shift in uint64, a python int shift would promote uint64 to float64
+    ids = np.asarray(node_or_chunk_ids, dtype=np.uint64)
+    layers = ids >> np.uint64(64 - meta.graph_config.LAYER_ID_BITS)
+    return layers.astype(int)
 
 
 def get_chunk_coordinates(meta, node_or_chunk_id: np.uint64) -> np.ndarray:
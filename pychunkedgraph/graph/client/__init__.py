@@ -19,6 +19,7 @@ Please see `base.py` for more details.
 
 from collections import namedtuple
 
+from .bigtable import get_client_info as get_bigtable_client_info
 from .bigtable.client import Client as BigTableClient
 
 
@@ -37,8 +38,6 @@ def get_default_client_info():
     """
 
     # TODO make dynamic after multiple platform support is added
-    from .bigtable import get_client_info as get_bigtable_client_info
-
     return BackendClientInfo(
         CONFIG=get_bigtable_client_info(admin=True, read_only=False)
     )
@@ -36,6 +36,18 @@ from ...meta import ChunkedGraphMeta
 from ...utils.generic import get_valid_timestamp
 
 
+_STREAM_HANDLER = None
+
+
+def _get_stream_handler() -> logging.Handler:
+    """Handler shared by all table loggers, only the logger name differs."""
+    global _STREAM_HANDLER
+    if _STREAM_HANDLER is None:
+        _STREAM_HANDLER = logging.StreamHandler(sys.stdout)
+        _STREAM_HANDLER.setLevel(logging.WARNING)
+    return _STREAM_HANDLER
+
+
 class Client(bigtable.Client, ClientWithIDGen, OperationLogger):
     def __init__(
         self,
@@ -64,9 +76,7 @@ class Client(bigtable.Client, ClientWithIDGen, OperationLogger):
         )
         self.logger.setLevel(logging.WARNING)
         if not self.logger.handlers:
-            sh = logging.StreamHandler(sys.stdout)
-            sh.setLevel(logging.WARNING)
-            self.logger.addHandler(sh)
+            self.logger.addHandler(_get_stream_handler())
         self._graph_meta = graph_meta
         self._version = None
         self._max_row_key_count = config.MAX_ROW_KEY_COUNT
@@ -137,10 +147,12 @@ class Client(bigtable.Client, ClientWithIDGen, OperationLogger):
         end_time=None,
         end_time_inclusive: bool = False,
         fake_edges: bool = False,
+        id_ranges=None,
     ):
         """
         Read nodes and their properties.
-        Accepts a range of node IDs or specific node IDs.
+        Accepts a range of node IDs, specific node IDs
+        or multiple inclusive (start_id, end_id) ranges read in one request.
         """
         if node_ids is not None and len(node_ids) > self._max_row_key_count:
             # bigtable reading is faster
@@ -159,6 +171,15 @@ class Client(bigtable.Client, ClientWithIDGen, OperationLogger):
             )
             if node_ids is not None
             else None,
+            row_ranges=(
+                (
+                    serialize_uint64(start, fake_edges=fake_edges),
+                    serialize_uint64(end, fake_edges=fake_edges),
+                )
+                for start, end in id_ranges
+            )
+            if id_ranges is not None
+            else None,
             columns=properties,
             start_time=start_time,
             end_time=end_time,
@@ -557,14 +578,22 @@ class Client(bigtable.Client, ClientWithIDGen, OperationLogger):
         operation_ids: typing.Sequence[np.uint64],
     ) -> typing.Union[datetime, None]:
         """Minimum of multiple lock timestamps."""
+        if len(root_ids) == 0:
+            return None
+        # one read for all roots, this runs while the roots are locked
+        rows = self.read_nodes(
+            node_ids=root_ids, properties=attributes.Concurrency.Lock
+        )
         time_stamps = []
         for root_id, operation_id in zip(root_ids, operation_ids):
-            time_stamp = self.get_lock_timestamp(root_id, operation_id)
-            if time_stamp is None:
+            row = rows.get(root_id, [])
+            if len(row) == 0:
+                self.logger.warning(f"No lock found for {root_id}")
                 return None
-            time_stamps.append(time_stamp)
-        if len(time_stamps) == 0:
-            return None
+            if row[0].value != operation_id:
+                self.logger.warning(f"{root_id} not locked with {operation_id}")
+                return None
+            time_stamps.append(row[0].timestamp)
         return np.min(time_stamps)
 
     # IDs
@@ -672,6 +701,7 @@ class Client(bigtable.Client, ClientWithIDGen, OperationLogger):
         end_key: typing.Optional[bytes] = None,
         end_key_inclusive: bool = False,
         row_keys: typing.Optional[typing.Iterable[bytes]] = None,
+        row_ranges: typing.Optional[typing.Iterable[typing.Tuple[bytes, bytes]]] = None,
         columns: typing.Optional[
             typing.Union[typing.Iterable[attributes._Attribute], attributes._Attribute]
         ] = None,
@@ -699,6 +729,9 @@ class Client(bigtable.Client, ClientWithIDGen, OperationLogger):
             row_keys {typing.Optional[typing.Iterable[bytes]]} -- An `typing.Iterable` containing possibly
                 non-contiguous row keys. Takes precedence over `start_key` and `end_key`.
                 (default: {None})
+            row_ranges {typing.Optional[typing.Iterable[typing.Tuple[bytes, bytes]]]} -- Inclusive
+                (start, end) row key ranges, read in one request. Takes precedence over
+                `start_key` and `end_key`. (default: {None})
             columns {typing.Optional[typing.Union[typing.Iterable[attributes._Attribute], attributes._Attribute]]} --
                 typing.Optional filtering by columns to speed up the query. If `columns` is a single
                 column (not iterable), the column key will be omitted from the result.
@@ -726,6 +759,14 @@ class Client(bigtable.Client, ClientWithIDGen, OperationLogger):
         row_set = RowSet()
         if row_keys is not None:
             row_set.row_keys = list(row_keys)
+        elif row_ranges is not None:
+            for range_start, range_end in row_ranges:
+                row_set.add_row_range_from_keys(
+                    start_key=range_start,
+                    start_inclusive=True,
+                    end_key=range_end,
+                    end_inclusive=True,
+                )
         elif start_key is not None and end_key is not None:
             row_set.add_row_range_from_keys(
                 start_key=start_key,
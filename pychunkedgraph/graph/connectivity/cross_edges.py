@@ -8,7 +8,6 @@ from typing import List
 from typing import Dict
 
 import numpy as np
-from multiwrapper.multiprocessing_utils import multiprocess_func
 
 from .. import attributes
 from ..types import empty_2d
@@ -20,6 +19,27 @@ from ..utils.generic import filter_failed_node_ids
 from ..chunks.atomic import get_touching_atomic_chunks
 from ..chunks.atomic import get_bounding_atomic_chunks
 from ...utils.general import chunked
+from ...utils.general import unique2d
+
+# atomic chunks read per request, bounds memory of a batch read
+ATOMIC_CHUNKS_PER_READ = 64
+
+# ChunkedGraph of a pool worker process, created once by `_init_worker`
+_CG = None
+
+
+def _init_worker(cg_info):
+    global _CG
+    _CG = ChunkedGraph(**cg_info)
+
+
+def _get_pool(cg: ChunkedGraph, n_tasks: int) -> mp.Pool:
+    """Pool whose workers build their ChunkedGraph once, not once per task."""
+    return mp.Pool(
+        max(1, min(n_tasks, mp.cpu_count())),
+        initializer=_init_worker,
+        initargs=(cg.get_serialized_info(),),
+    )
 
 
 def get_children_chunk_cross_edges(
@@ -31,41 +51,31 @@ def get_children_chunk_cross_edges(
     """
     atomic_chunks = get_touching_atomic_chunks(cg.meta, layer, chunk_coord)
     if not len(atomic_chunks):
-        return []
+        return empty_2d
 
     print(f"touching atomic chunk count {len(atomic_chunks)}")
     if not use_threads:
         return _get_children_chunk_cross_edges(cg, atomic_chunks, layer - 1)
 
     print("get_children_chunk_cross_edges, atomic chunks", len(atomic_chunks))
-    with mp.Manager() as manager:
-        edge_ids_shared = manager.list()
-        edge_ids_shared.append(empty_2d)
-
-        task_size = int(math.ceil(len(atomic_chunks) / mp.cpu_count() / 10))
-        chunked_l2chunk_list = chunked(atomic_chunks, task_size)
-        multi_args = []
-        for atomic_chunks in chunked_l2chunk_list:
-            multi_args.append(
-                (edge_ids_shared, cg.get_serialized_info(), atomic_chunks, layer - 1)
-            )
-
-        multiprocess_func(
-            _get_children_chunk_cross_edges_helper,
-            multi_args,
-            n_threads=min(len(multi_args), mp.cpu_count()),
-        )
+    task_size = max(1, int(math.ceil(len(atomic_chunks) / mp.cpu_count() / 10)))
+    chunked_l2chunk_list = chunked(atomic_chunks, task_size)
+    multi_args = []
+    for atomic_chunks in chunked_l2chunk_list:
+        multi_args.append((atomic_chunks, layer - 1))
 
-        cross_edges = np.concatenate(edge_ids_shared)
-        if cross_edges.size:
-            return np.unique(cross_edges, axis=0)
-        return cross_edges
+    with _get_pool(cg, len(multi_args)) as pool:
+        edge_ids = pool.map(_get_children_chunk_cross_edges_helper, multi_args)
 
+    cross_edges = np.concatenate([empty_2d] + edge_ids)
+    if cross_edges.size:
+        return unique2d(cross_edges)
+    return cross_edges
 
-def _get_children_chunk_cross_edges_helper(args) -> None:
-    edge_ids_shared, cg_info, atomic_chunks, layer = args
-    cg = ChunkedGraph(**cg_info)
-    edge_ids_shared.append(_get_children_chunk_cross_edges(cg, atomic_chunks, layer))
+
+def _get_children_chunk_cross_edges_helper(args) -> np.ndarray:
+    atomic_chunks, layer = args
+    return _get_children_chunk_cross_edges(_CG, atomic_chunks, layer)
 
 
 def _get_children_chunk_cross_edges(cg, atomic_chunks, layer) -> None:
@@ -73,40 +83,44 @@ def _get_children_chunk_cross_edges(cg, atomic_chunks, layer) -> None:
         f"_get_children_chunk_cross_edges {layer} atomic_chunks count {len(atomic_chunks)}"
     )
     cross_edges = [empty_2d]
-    for layer2_chunk in atomic_chunks:
-        edges = _read_atomic_chunk_cross_edges(cg, layer2_chunk, layer)
+    for range_read, l2ids in _read_atomic_chunks(cg, atomic_chunks, [layer]):
+        edges = _get_atomic_chunk_cross_edges(range_read, l2ids, layer)
         cross_edges.append(edges)
 
     cross_edges = np.concatenate(cross_edges)
     if not cross_edges.size:
         return empty_2d
     print(f"getting roots at stop_layer {layer} {cross_edges.shape}")
-    cross_edges[:, 0] = cg.get_roots(cross_edges[:, 0], stop_layer=layer, ceil=False)
-    cross_edges[:, 1] = cg.get_roots(cross_edges[:, 1], stop_layer=layer, ceil=False)
-    result = np.unique(cross_edges, axis=0) if cross_edges.size else empty_2d
+    # one lookup for the ids of both columns, they repeat across edges
+    node_ids, inverse = np.unique(cross_edges, return_inverse=True)
+    parents = cg.get_roots(node_ids, stop_layer=layer, ceil=False)
+    cross_edges = parents[inverse.reshape(-1)].reshape(-1, 2)
+    result = unique2d(cross_edges) if cross_edges.size else empty_2d
     print(f"_get_children_chunk_cross_edges done {result.shape}")
     return result
 
 
-def _read_atomic_chunk_cross_edges(
-    cg, chunk_coord: Sequence[int], cross_edge_layer: int
+def _get_atomic_chunk_cross_edges(
+    range_read: Dict, l2ids: np.ndarray, cross_edge_layer: int
 ) -> np.ndarray:
     cross_edge_col = attributes.Connectivity.CrossChunkEdge[cross_edge_layer]
-    range_read, l2ids = _read_atomic_chunk(cg, chunk_coord, [cross_edge_layer])
 
-    parent_neighboring_chunk_supervoxels_d = defaultdict(list)
+    edge_l2ids = []
+    nebor_svs = []
     for l2id in l2ids:
         if not cross_edge_col in range_read[l2id]:
             continue
         edges = range_read[l2id][cross_edge_col][0].value
-        parent_neighboring_chunk_supervoxels_d[l2id] = edges[:, 1]
+        edge_l2ids.append(l2id)
+        nebor_svs.append(edges[:, 1])
 
-    cross_edges = [empty_2d]
-    for l2id in parent_neighboring_chunk_supervoxels_d:
-        nebor_svs = parent_neighboring_chunk_supervoxels_d[l2id]
-        chunk_parent_ids = np.array([l2id] * len(nebor_svs), dtype=basetypes.NODE_ID)
-        cross_edges.append(np.vstack([chunk_parent_ids, nebor_svs]).T)
-    cross_edges = np.concatenate(cross_edges)
+    if not edge_l2ids:
+        return empty_2d
+    # one output array, each l2id repeated for its neighboring supervoxels
+    sizes = [len(svs) for svs in nebor_svs]
+    cross_edges = np.empty((sum(sizes), 2), dtype=basetypes.NODE_ID)
+    cross_edges[:, 0] = np.repeat(np.array(edge_l2ids, dtype=basetypes.NODE_ID), sizes)
+    cross_edges[:, 1] = np.concatenate(nebor_svs)
     return cross_edges
 
 
@@ -128,50 +142,43 @@ def get_chunk_nodes_cross_edge_layer(
         return _get_chunk_nodes_cross_edge_layer(cg, atomic_chunks, layer)
 
     print("divide tasks")
-    cg_info = cg.get_serialized_info()
-    manager = mp.Manager()
-    ids_l_shared = manager.list()
-    layers_l_shared = manager.list()
-    task_size = int(math.ceil(len(atomic_chunks) / mp.cpu_count() / 10))
+    task_size = max(1, int(math.ceil(len(atomic_chunks) / mp.cpu_count() / 10)))
     chunked_l2chunk_list = chunked(atomic_chunks, task_size)
     multi_args = []
     for atomic_chunks in chunked_l2chunk_list:
-        multi_args.append(
-            (ids_l_shared, layers_l_shared, cg_info, atomic_chunks, layer)
-        )
+        multi_args.append((atomic_chunks, layer))
     print("divide tasks complete")
 
-    multiprocess_func(
-        _get_chunk_nodes_cross_edge_layer_helper,
-        multi_args,
-        n_threads=min(len(multi_args), mp.cpu_count()),
-    )
+    with _get_pool(cg, len(multi_args)) as pool:
+        results = pool.map(_get_chunk_nodes_cross_edge_layer_helper, multi_args)
 
-    node_layer_d_shared = manager.dict()
-    _find_min_layer(node_layer_d_shared, ids_l_shared, layers_l_shared)
+    ids_l = [node_ids for node_ids, _ in results]
+    layers_l = [layers for _, layers in results]
+    node_layer_d = _find_min_layer(ids_l, layers_l)
     print("_find_min_layer complete")
-    return node_layer_d_shared
+    return node_layer_d
 
 
 def _get_chunk_nodes_cross_edge_layer_helper(args):
-    ids_l_shared, layers_l_shared, cg_info, atomic_chunks, layer = args
-    cg = ChunkedGraph(**cg_info)
-    node_layer_d = _get_chunk_nodes_cross_edge_layer(cg, atomic_chunks, layer)
-    ids_l_shared.append(np.fromiter(node_layer_d.keys(), dtype=basetypes.NODE_ID))
-    layers_l_shared.append(np.fromiter(node_layer_d.values(), dtype=np.uint8))
+    atomic_chunks, layer = args
+    node_layer_d = _get_chunk_nodes_cross_edge_layer(_CG, atomic_chunks, layer)
+    node_ids = np.fromiter(node_layer_d.keys(), dtype=basetypes.NODE_ID)
+    layers = np.fromiter(node_layer_d.values(), dtype=np.uint8)
+    return node_ids, layers
 
 
 def _get_chunk_nodes_cross_edge_layer(cg, atomic_chunks, layer):
     atomic_node_layer_d = {}
-    for atomic_chunk in atomic_chunks:
-        chunk_node_layer_d = _read_atomic_chunk_cross_edge_nodes(
-            cg, atomic_chunk, range(layer, cg.meta.layer_count + 1)
+    cross_edge_layers = range(layer, cg.meta.layer_count + 1)
+    for range_read, l2ids in _read_atomic_chunks(cg, atomic_chunks, cross_edge_layers):
+        chunk_node_layer_d = _get_atomic_chunk_cross_edge_nodes(
+            range_read, l2ids, cross_edge_layers
         )
         atomic_node_layer_d.update(chunk_node_layer_d)
 
     l2ids = np.fromiter(atomic_node_layer_d.keys(), dtype=basetypes.NODE_ID)
     parents = cg.get_roots(l2ids, stop_layer=layer - 1, ceil=False)
-    layers = np.fromiter(atomic_node_layer_d.values(), dtype=int)
+    layers = np.fromiter(atomic_node_layer_d.values(), dtype=np.uint8)
 
     node_layer_d = defaultdict(lambda: cg.meta.layer_count)
     for i, parent in enumerate(parents):
@@ -179,9 +186,8 @@ def _get_chunk_nodes_cross_edge_layer(cg, atomic_chunks, layer):
     return node_layer_d
 
 
-def _read_atomic_chunk_cross_edge_nodes(cg, chunk_coord, cross_edge_layers):
+def _get_atomic_chunk_cross_edge_nodes(range_read, l2ids, cross_edge_layers):
     node_layer_d = {}
-    range_read, l2ids = _read_atomic_chunk(cg, chunk_coord, cross_edge_layers)
     for l2id in l2ids:
         for layer in cross_edge_layers:
             if attributes.Connectivity.CrossChunkEdge[layer] in range_read[l2id]:
@@ -190,30 +196,37 @@ def _read_atomic_chunk_cross_edge_nodes(cg, chunk_coord, cross_edge_layers):
     return node_layer_d
 
 
-def _find_min_layer(node_layer_d_shared, ids_l_shared, layers_l_shared):
-    node_ids = np.concatenate(ids_l_shared)
-    layers = np.concatenate(layers_l_shared)
-    for i, node_id in enumerate(node_ids):
-        layer = node_layer_d_shared.get(node_id, layers[i])
-        node_layer_d_shared[node_id] = min(layer, layers[i])
+def _find_min_layer(ids_l, layers_l) -> Dict:
+    node_ids = np.concatenate([np.array([], dtype=basetypes.NODE_ID)] + ids_l)
+    layers = np.concatenate([np.array([], dtype=np.uint8)] + layers_l)
+    # sort by node id, then layer; first occurrence of each id has its min layer
+    order = np.lexsort((layers, node_ids))
+    node_ids, idx = np.unique(node_ids[order], return_index=True)
+    return dict(zip(node_ids, layers[order][idx]))
 
 
-def _read_atomic_chunk(cg, chunk_coord, layers):
-    x, y, z = chunk_coord
+def _read_atomic_chunks(cg, chunk_coords, layers):
+    """
+    Yields (range_read, l2ids) for each atomic chunk, reading
+    ATOMIC_CHUNKS_PER_READ chunks per multi range request.
+    """
     child_col = attributes.Hierarchy.Child
-    range_read = cg.range_read_chunk(
-        cg.get_chunk_id(layer=2, x=x, y=y, z=z),
-        properties=[child_col]
-        + [attributes.Connectivity.CrossChunkEdge[l] for l in layers],
-    )
-
-    row_ids = []
-    max_children_ids = []
-    for row_id, row_data in range_read.items():
-        row_ids.append(row_id)
-        max_children_ids.append(np.max(row_data[child_col][0].value))
-
-    row_ids = np.array(row_ids, dtype=basetypes.NODE_ID)
-    segment_ids = np.array([cg.get_segment_id(r_id) for r_id in row_ids])
-    l2ids = filter_failed_node_ids(row_ids, segment_ids, max_children_ids)
-    return range_read, l2ids
+    properties = [child_col]
+    properties.extend(attributes.Connectivity.CrossChunkEdge[l] for l in layers)
+    for batch_coords in chunked(chunk_coords, ATOMIC_CHUNKS_PER_READ):
+        chunk_ids = [
+            cg.get_chunk_id(layer=2, x=x, y=y, z=z) for x, y, z in batch_coords
+        ]
+        chunks_d = cg.range_read_chunks(chunk_ids, properties=properties)
+        for chunk_id in chunk_ids:
+            range_read = chunks_d.pop(chunk_id)
+            row_ids = np.empty(len(range_read), dtype=basetypes.NODE_ID)
+            max_children_ids = np.empty(len(range_read), dtype=basetypes.NODE_ID)
+            for i, (row_id, row_data) in enumerate(range_read.items()):
+                row_ids[i] = row_id
+                max_children_ids[i] = np.max(row_data[child_col][0].value)
+
+            # all rows are in the same chunk, one mask extracts every segment id
+            segment_ids = row_ids & cg.get_segment_id_limit(chunk_id)
+            l2ids = filter_failed_node_ids(row_ids, segment_ids, max_children_ids)
+            yield range_read, l2ids
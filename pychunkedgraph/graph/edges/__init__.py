@@ -73,6 +73,19 @@ class Edges:
         areas = np.concatenate([self.areas, other.areas])
         return Edges(node_ids1, node_ids2, affinities=affinities, areas=areas)
 
+    @classmethod
+    def concatenate(cls, edges_list) -> "Edges":
+        """concatenate many Edges instances with one allocation per array"""
+        edges_list = list(edges_list)
+        if len(edges_list) == 0:
+            return cls([], [])
+        return cls(
+            np.concatenate([e.node_ids1 for e in edges_list]),
+            np.concatenate([e.node_ids2 for e in edges_list]),
+            affinities=np.concatenate([e.affinities for e in edges_list]),
+            areas=np.concatenate([e.areas for e in edges_list]),
+        )
+
     def __iadd__(self, other):
         self.node_ids1 = np.concatenate([self.node_ids1, other.node_ids1])
         self.node_ids2 = np.concatenate([self.node_ids2, other.node_ids2])
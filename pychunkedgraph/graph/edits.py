@@ -240,6 +240,8 @@ def add_edges(
 
     new_roots = create_parents.run()
     new_entries = create_parents.create_new_entries()
+    new_roots = np.asarray(new_roots, dtype=basetypes.NODE_ID)
+    new_l2_ids = np.asarray(new_l2_ids, dtype=basetypes.NODE_ID)
     return new_roots, new_l2_ids, new_entries
 
 
@@ -340,6 +342,8 @@ def remove_edges(
     )
     new_roots = create_parents.run()
     new_entries = create_parents.create_new_entries()
+    new_roots = np.asarray(new_roots, dtype=basetypes.NODE_ID)
+    new_l2_ids = np.asarray(new_l2_ids, dtype=basetypes.NODE_ID)
     return new_roots, new_l2_ids, new_entries
 
 
@@ -596,4 +600,5 @@ class CreateParentNodes:
                             time_stamp=self._time_stamp,
                         )
                     )
-        return rows + self._update_root_id_lineage()
+        rows.extend(self._update_root_id_lineage())
+        return rows
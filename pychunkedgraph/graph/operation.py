@@ -36,6 +36,20 @@ if TYPE_CHECKING:
     from .chunkedgraph import ChunkedGraph
 
 
+def _ids_intersect(ids1: np.ndarray, ids2: np.ndarray) -> bool:
+    # edits usually have a handful of ids, sets beat numpy setup there
+    if ids1.size + ids2.size <= 64:
+        return not set(ids1.tolist()).isdisjoint(ids2.tolist())
+    return np.intersect1d(ids1, ids2).size > 0
+
+
+def _check_supervoxels(cg: "ChunkedGraph", ids: np.ndarray) -> None:
+    # one vectorized layer extraction for all ids instead of a call per id
+    not_sv = cg.get_chunk_layers(ids) != 1
+    if np.any(not_sv):
+        raise PreconditionError(f"IDs must be supervoxels, got {ids[not_sv][0]}.")
+
+
 class GraphEditOperation(ABC):
     __slots__ = [
         "cg",
@@ -71,13 +85,15 @@ class GraphEditOperation(ABC):
         self.privileged_mode = False
 
         if source_coords is not None:
-            self.source_coords = np.atleast_2d(source_coords).astype(
-                basetypes.COORDINATES
-            )
+            self.source_coords = np.asarray(
+                source_coords, dtype=basetypes.COORDINATES
+            ).reshape(-1, 3)
             if self.source_coords.size == 0:
                 self.source_coords = None
         if sink_coords is not None:
-            self.sink_coords = np.atleast_2d(sink_coords).astype(basetypes.COORDINATES)
+            self.sink_coords = np.asarray(
+                sink_coords, dtype=basetypes.COORDINATES
+            ).reshape(-1, 3)
             if self.sink_coords.size == 0:
                 self.sink_coords = None
 
@@ -109,6 +125,7 @@ class GraphEditOperation(ABC):
                 user_id=user_id,
                 superseded_operation_id=operation_id,
                 multicut_as_split=multicut_as_split,
+                log_record=log_record,
             )
         else:
             return RedoOperation(
@@ -116,6 +133,7 @@ class GraphEditOperation(ABC):
                 user_id=user_id,
                 superseded_operation_id=operation_id,
                 multicut_as_split=multicut_as_split,
+                log_record=log_record,
             )
 
     @staticmethod
@@ -426,7 +444,11 @@ class GraphEditOperation(ABC):
             self.cg.meta.custom_data["operation_id"] = operation_id
             timestamp = self.cg.client.get_consolidated_lock_timestamp(
                 lock.locked_root_ids,
-                np.array([lock.operation_id] * len(lock.locked_root_ids)),
+                np.full(
+                    len(lock.locked_root_ids),
+                    lock.operation_id,
+                    dtype=basetypes.NODE_ID,
+                ),
             )
 
             log_record_before_edit = self._create_log_record(
@@ -483,8 +505,9 @@ class GraphEditOperation(ABC):
 
     def _write(self, lock, timestamp, new_root_ids, new_lvl2_ids, affected_records):
         """Helper to persist changes after an edit."""
-        new_root_ids = np.array(new_root_ids, dtype=basetypes.NODE_ID)
-        new_lvl2_ids = np.array(new_lvl2_ids, dtype=basetypes.NODE_ID)
+        # no copy for arrays from edits.add_edges/remove_edges
+        new_root_ids = np.asarray(new_root_ids, dtype=basetypes.NODE_ID)
+        new_lvl2_ids = np.asarray(new_lvl2_ids, dtype=basetypes.NODE_ID)
 
         # this must be written first to indicate writing has started.
         log_record_after_edit = self._create_log_record(
@@ -504,7 +527,7 @@ class GraphEditOperation(ABC):
             # indefinite lock for writing, if a node instance or pod dies during this
             # the roots must stay locked indefinitely to prevent further corruption.
             self.cg.client.write(
-                [log_record_after_edit] + affected_records,
+                [log_record_after_edit, *affected_records],
                 lock.locked_root_ids,
                 operation_id=lock.operation_id,
                 slow_retry=False,
@@ -569,21 +592,24 @@ class MergeOperation(GraphEditOperation):
         super().__init__(
             cg, user_id=user_id, source_coords=source_coords, sink_coords=sink_coords
         )
-        self.added_edges = np.atleast_2d(added_edges).astype(basetypes.NODE_ID)
-        self.bbox_offset = np.atleast_1d(bbox_offset).astype(basetypes.COORDINATES)
+        self.added_edges = np.asarray(added_edges, dtype=basetypes.NODE_ID).reshape(
+            -1, 2
+        )
+        self.bbox_offset = np.asarray(bbox_offset, dtype=basetypes.COORDINATES).ravel()
         self.allow_same_segment_merge = allow_same_segment_merge
 
         self.affinities = None
         if affinities is not None:
-            self.affinities = np.atleast_1d(affinities).astype(basetypes.EDGE_AFFINITY)
+            self.affinities = np.asarray(
+                affinities, dtype=basetypes.EDGE_AFFINITY
+            ).ravel()
             if self.affinities.size == 0:
                 self.affinities = None
 
         if np.any(np.equal(self.added_edges[:, 0], self.added_edges[:, 1])):
             raise PreconditionError("Requested merge contains at least 1 self-loop.")
 
-        layers = self.cg.get_chunk_layers(self.added_edges.ravel())
-        assert np.sum(layers) == layers.size, "Supervoxels expected."
+        _check_supervoxels(self.cg, self.added_edges.ravel())
 
     def _update_root_ids(self) -> np.ndarray:
         root_ids = np.unique(
@@ -707,13 +733,14 @@ class SplitOperation(GraphEditOperation):
         super().__init__(
             cg, user_id=user_id, source_coords=source_coords, sink_coords=sink_coords
         )
-        self.removed_edges = np.atleast_2d(removed_edges).astype(basetypes.NODE_ID)
-        self.bbox_offset = np.atleast_1d(bbox_offset).astype(basetypes.COORDINATES)
+        self.removed_edges = np.asarray(removed_edges, dtype=basetypes.NODE_ID).reshape(
+            -1, 2
+        )
+        self.bbox_offset = np.asarray(bbox_offset, dtype=basetypes.COORDINATES).ravel()
         if np.any(np.equal(self.removed_edges[:, 0], self.removed_edges[:, 1])):
             raise PreconditionError("Requested split contains at least 1 self-loop.")
 
-        layers = self.cg.get_chunk_layers(self.removed_edges.ravel())
-        assert np.sum(layers) == layers.size, "IDs must be supervoxels."
+        _check_supervoxels(self.cg, self.removed_edges.ravel())
 
     def _update_root_ids(self) -> np.ndarray:
         root_ids = np.unique(
@@ -730,18 +757,12 @@ class SplitOperation(GraphEditOperation):
     def _apply(
         self, *, operation_id, timestamp
     ) -> Tuple[np.ndarray, np.ndarray, List["bigtable.row.Row"]]:
-        if (
-            len(
-                set(
-                    self.cg.get_roots(
-                        self.removed_edges.ravel(),
-                        assert_roots=True,
-                        time_stamp=self.parent_ts,
-                    )
-                )
-            )
-            > 1
-        ):
+        root_ids = self.cg.get_roots(
+            self.removed_edges.ravel(),
+            assert_roots=True,
+            time_stamp=self.parent_ts,
+        )
+        if np.unique(root_ids).size > 1:
             raise PreconditionError("Supervoxels must belong to the same object.")
 
         with TimeIt("subgraph", self.cg.graph_id, operation_id):
@@ -846,20 +867,18 @@ class MulticutOperation(GraphEditOperation):
             cg, user_id=user_id, source_coords=source_coords, sink_coords=sink_coords
         )
         self.removed_edges = removed_edges
-        self.source_ids = np.atleast_1d(source_ids).astype(basetypes.NODE_ID)
-        self.sink_ids = np.atleast_1d(sink_ids).astype(basetypes.NODE_ID)
-        self.bbox_offset = np.atleast_1d(bbox_offset).astype(basetypes.COORDINATES)
+        self.source_ids = np.asarray(source_ids, dtype=basetypes.NODE_ID).ravel()
+        self.sink_ids = np.asarray(sink_ids, dtype=basetypes.NODE_ID).ravel()
+        self.bbox_offset = np.asarray(bbox_offset, dtype=basetypes.COORDINATES).ravel()
         self.path_augment = path_augment
         self.disallow_isolating_cut = disallow_isolating_cut
-        if np.any(np.in1d(self.sink_ids, self.source_ids)):
+        if _ids_intersect(self.sink_ids, self.source_ids):
             raise PreconditionError(
                 "Supervoxels exist in both sink and source, "
                 "try placing the points further apart."
             )
 
-        ids = np.concatenate([self.source_ids, self.sink_ids])
-        layers = self.cg.get_chunk_layers(ids)
-        assert np.sum(layers) == layers.size, "IDs must be supervoxels."
+        _check_supervoxels(self.cg, np.concatenate([self.source_ids, self.sink_ids]))
 
     def _update_root_ids(self) -> np.ndarray:
         sink_and_source_ids = np.concatenate((self.source_ids, self.sink_ids))
@@ -876,14 +895,12 @@ class MulticutOperation(GraphEditOperation):
         self, *, operation_id, timestamp
     ) -> Tuple[np.ndarray, np.ndarray, List["bigtable.row.Row"]]:
         # Verify that sink and source are from the same root object
-        root_ids = set(
-            self.cg.get_roots(
-                np.concatenate([self.source_ids, self.sink_ids]),
-                assert_roots=True,
-                time_stamp=self.parent_ts,
-            )
+        root_ids = self.cg.get_roots(
+            np.concatenate([self.source_ids, self.sink_ids]),
+            assert_roots=True,
+            time_stamp=self.parent_ts,
         )
-        if len(root_ids) > 1:
+        if np.unique(root_ids).size > 1:
             raise PreconditionError("Supervoxels must belong to the same object.")
 
         bbox = get_bbox(
@@ -893,7 +910,7 @@ class MulticutOperation(GraphEditOperation):
         )
         with TimeIt("get_subgraph", self.cg.graph_id, operation_id):
             l2id_agglomeration_d, edges = self.cg.get_subgraph(
-                root_ids.pop(), bbox=bbox, bbox_is_coordinate=True
+                root_ids[0], bbox=bbox, bbox_is_coordinate=True
             )
 
             edges = reduce(lambda x, y: x + y, edges, Edges([], []))
@@ -984,6 +1001,8 @@ class RedoOperation(GraphEditOperation):
     :param multicut_as_split: If true, don't recalculate MultiCutOperation, just
             use the resulting removed edges and generate SplitOperation instead (faster).
     :type multicut_as_split: bool
+    :param log_record: Already read log record of superseded_operation_id, if available
+    :type log_record: Optional[Dict]
     """
 
     __slots__ = [
@@ -1001,9 +1020,11 @@ class RedoOperation(GraphEditOperation):
         user_id: str,
         superseded_operation_id: np.uint64,
         multicut_as_split: bool,
+        log_record: Optional[Dict] = None,
     ) -> None:
         super().__init__(cg, user_id=user_id)
-        log_record, _ = cg.client.read_log_entry(superseded_operation_id)
+        if log_record is None:
+            log_record, _ = cg.client.read_log_entry(superseded_operation_id)
         log_record_type = GraphEditOperation.get_log_record_type(log_record)
         if log_record_type in (RedoOperation, UndoOperation):
             raise ValueError(
@@ -1108,6 +1129,8 @@ class UndoOperation(GraphEditOperation):
     :param multicut_as_split: If true, don't recalculate MultiCutOperation, just
             use the resulting removed edges and generate SplitOperation instead (faster).
     :type multicut_as_split: bool
+    :param log_record: Already read log record of superseded_operation_id, if available
+    :type log_record: Optional[Dict]
     """
 
     __slots__ = [
@@ -1125,9 +1148,11 @@ class UndoOperation(GraphEditOperation):
         user_id: str,
         superseded_operation_id: np.uint64,
         multicut_as_split: bool,
+        log_record: Optional[Dict] = None,
     ) -> None:
         super().__init__(cg, user_id=user_id)
-        log_record, _ = cg.client.read_log_entry(superseded_operation_id)
+        if log_record is None:
+            log_record, _ = cg.client.read_log_entry(superseded_operation_id)
         log_record_type = GraphEditOperation.get_log_record_type(log_record)
         if log_record_type in (RedoOperation, UndoOperation):
             raise ValueError(
@@ -16,7 +16,7 @@ def build_gt_graph(
     :param hashed: bool
     :return: graph, capacities
     """
-    edges = np.array(edges, np.uint64)
+    edges = np.asarray(edges, dtype=np.uint64)
     if weights is not None:
         assert len(weights) == len(edges)
         weights = np.array(weights)
@@ -24,8 +24,6 @@ def build_gt_graph(
     unique_ids, edges = np.unique(edges, return_inverse=True)
     edges = edges.reshape(-1, 2)
 
-    edges = np.array(edges)
-
     if make_directed:
         is_directed = True
         edges = np.concatenate([edges, edges[:, [1, 0]]])
@@ -11,7 +11,6 @@ from typing import Optional
 from typing import Union
 from typing import Sequence
 from typing import Tuple
-from collections import defaultdict
 
 import numpy as np
 import pandas as pd
@@ -127,14 +126,14 @@ def filter_failed_node_ids(row_ids, segment_ids, max_children_ids):
     """filters node ids that were created by failed/in-complete jobs"""
     sorting = np.argsort(segment_ids)[::-1]
     row_ids = row_ids[sorting]
-    max_child_ids = np.array(max_children_ids)[sorting]
-
-    counter = defaultdict(int)
-    max_child_ids_occ_so_far = np.zeros(len(max_child_ids), dtype=int)
-    for i_row in range(len(max_child_ids)):
-        max_child_ids_occ_so_far[i_row] = counter[max_child_ids[i_row]]
-        counter[max_child_ids[i_row]] += 1
-    return row_ids[max_child_ids_occ_so_far == 0]
+    max_child_ids = np.asarray(max_children_ids)[sorting]
+
+    # sorted by descending segment id, the first occurrence of a max child id
+    # is the latest node created for it
+    _, first_idx = np.unique(max_child_ids, return_index=True)
+    mask = np.zeros(len(max_child_ids), dtype=bool)
+    mask[first_idx] = True
+    return row_ids[mask]
 
 
 def _get_google_compatible_time_stamp(
@@ -30,6 +30,12 @@ class _Serializer:
 
 
 class NumPyArray(_Serializer):
+    @staticmethod
+    def _serialize(val, dtype):
+        # one vectorized cast (and byteswap if needed) + copy, zero-copy when
+        # `val` already has `dtype`; also accepts lists of ids
+        return np.asarray(val, dtype=dtype).tobytes()
+
     @staticmethod
     def _deserialize(val, dtype, shape=None, order=None):
         data = np.frombuffer(val, dtype=dtype)
@@ -41,7 +47,7 @@ class NumPyArray(_Serializer):
 
     def __init__(self, dtype, shape=None, order=None, compression_level=None):
         super().__init__(
-            serializer=lambda x: x.newbyteorder(dtype.byteorder).tobytes(),
+            serializer=lambda x: NumPyArray._serialize(x, dtype),
             deserializer=lambda x: NumPyArray._deserialize(
                 x, dtype, shape=shape, order=order
             ),
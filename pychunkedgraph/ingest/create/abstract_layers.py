@@ -6,13 +6,15 @@ import time
 import math
 import datetime
 import multiprocessing as mp
+from collections import deque
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 from typing import Sequence
 from typing import List
+from typing import Dict
 
 import numpy as np
-from multiwrapper import multiprocessing_utils as mu
 
 from ...graph import types
 from ...graph import attributes
@@ -27,6 +29,16 @@ from ...graph.chunks.hierarchy import get_children_chunk_coords
 from ...graph.connectivity.cross_edges import get_children_chunk_cross_edges
 from ...graph.connectivity.cross_edges import get_chunk_nodes_cross_edge_layer
 
+# rows per bulk write and number of writes in flight while building more rows
+WRITE_BATCH_SIZE = 10000
+MAX_PENDING_WRITES = 4
+
+# state of a pool worker process, set once by `_init_worker`
+_CG = None
+_NODE_LAYER_D = None
+# parent chunk ids of the chunks written by this process, keyed by chunk id
+_PARENT_CHUNK_ID_DICTS = {}
+
 
 def add_layer(
     cg: ChunkedGraph,
@@ -50,17 +62,18 @@ def add_layer(
     )
 
     node_layers = cg.get_chunk_layers(children_ids)
-    edge_layers = cg.get_chunk_layers(np.unique(edge_ids))
+    # layer check does not need unique ids, skip sorting all edges
+    edge_layers = cg.get_chunk_layers(edge_ids.ravel())
     assert np.all(node_layers < layer_id), "invalid node layers"
     assert np.all(edge_layers < layer_id), "invalid edge layers"
     # Extract connected components
     # isolated_node_mask = ~np.in1d(children_ids, np.unique(edge_ids))
     # add_node_ids = children_ids[isolated_node_mask].squeeze()
-    add_edge_ids = np.vstack([children_ids, children_ids]).T
+    add_edge_ids = np.repeat(children_ids, 2).reshape(-1, 2)
 
-    edge_ids = list(edge_ids)
-    edge_ids.extend(add_edge_ids)
-    graph, _, _, graph_ids = flatgraph.build_gt_graph(edge_ids, make_directed=True)
+    edge_ids = np.concatenate([edge_ids, add_edge_ids])
+    # undirected graph, components are the same without doubling every edge
+    graph, _, _, graph_ids = flatgraph.build_gt_graph(edge_ids, is_directed=False)
     ccs = flatgraph.connected_components(graph)
     print("ccs", len(ccs))
     _write_connected_components(
@@ -79,58 +92,71 @@ def _read_children_chunks(
     cg: ChunkedGraph, layer_id, children_coords, use_threads=True
 ):
     if not use_threads:
-        children_ids = [types.empty_1d]
-        for child_coord in children_coords:
-            children_ids.append(_read_chunk([], cg, layer_id - 1, child_coord))
-        return np.concatenate(children_ids)
+        children_ids = _read_chunks(cg, layer_id - 1, children_coords)
+        return np.concatenate([types.empty_1d] + children_ids)
 
     print("_read_children_chunks")
-    with mp.Manager() as manager:
-        children_ids_shared = manager.list()
-        multi_args = []
-        for child_coord in children_coords:
-            multi_args.append(
-                (
-                    children_ids_shared,
-                    cg.get_serialized_info(),
-                    layer_id - 1,
-                    child_coord,
-                )
-            )
-        mu.multiprocess_func(
-            _read_chunk_helper,
-            multi_args,
-            n_threads=min(len(multi_args), mp.cpu_count()),
-        )
-        print("_read_children_chunks done")
-        return np.concatenate(children_ids_shared)
+    # each worker reads its chunks with one multi range request
+    task_size = max(1, int(math.ceil(len(children_coords) / mp.cpu_count())))
+    multi_args = []
+    for chunk_coords in chunked(children_coords, task_size):
+        multi_args.append((layer_id - 1, chunk_coords))
+
+    # workers return their arrays through the pool, no manager process needed
+    with _get_pool(cg, len(multi_args)) as pool:
+        results = pool.map(_read_chunks_helper, multi_args)
+    print("_read_children_chunks done")
+    children_ids = [types.empty_1d]
+    for chunks_ids in results:
+        children_ids.extend(chunks_ids)
+    return np.concatenate(children_ids)
+
+
+def _init_worker(cg_info, node_layer_d=None):
+    global _CG, _NODE_LAYER_D
+    _CG = ChunkedGraph(**cg_info)
+    _NODE_LAYER_D = node_layer_d
+    _PARENT_CHUNK_ID_DICTS.clear()
+
+
+def _get_pool(cg: ChunkedGraph, n_tasks: int, node_layer_d=None) -> mp.Pool:
+    """
+    Pool whose workers build their ChunkedGraph once, not once per task.
+    Read-only state shared by all tasks is passed once per worker, forked
+    workers inherit it without pickling.
+    """
+    return mp.Pool(
+        max(1, min(n_tasks, mp.cpu_count())),
+        initializer=_init_worker,
+        initargs=(cg.get_serialized_info(), node_layer_d),
+    )
 
 
-def _read_chunk_helper(args):
-    children_ids_shared, cg_info, layer_id, chunk_coord = args
-    cg = ChunkedGraph(**cg_info)
-    _read_chunk(children_ids_shared, cg, layer_id, chunk_coord)
+def _read_chunks_helper(args):
+    layer_id, chunk_coords = args
+    return _read_chunks(_CG, layer_id, chunk_coords)
 
 
-def _read_chunk(children_ids_shared, cg: ChunkedGraph, layer_id: int, chunk_coord):
-    print(f"_read_chunk {layer_id}, {chunk_coord}")
-    x, y, z = chunk_coord
-    range_read = cg.range_read_chunk(
-        cg.get_chunk_id(layer=layer_id, x=x, y=y, z=z),
-        properties=attributes.Hierarchy.Child,
-    )
-    row_ids = []
-    max_children_ids = []
-    for row_id, row_data in range_read.items():
-        row_ids.append(row_id)
-        max_children_ids.append(np.max(row_data[0].value))
-    row_ids = np.array(row_ids, dtype=basetypes.NODE_ID)
-    segment_ids = np.array([cg.get_segment_id(r_id) for r_id in row_ids])
+def _read_chunks(cg: ChunkedGraph, layer_id: int, chunk_coords) -> List[np.ndarray]:
+    print(f"_read_chunks {layer_id}, {len(chunk_coords)} chunks")
+    chunk_ids = [
+        cg.get_chunk_id(layer=layer_id, x=x, y=y, z=z) for x, y, z in chunk_coords
+    ]
+    chunks_d = cg.range_read_chunks(chunk_ids, properties=attributes.Hierarchy.Child)
 
-    row_ids = filter_failed_node_ids(row_ids, segment_ids, max_children_ids)
-    children_ids_shared.append(row_ids)
-    print(f"_read_chunk {layer_id}, {chunk_coord} done {len(row_ids)}")
-    return row_ids
+    result = []
+    for chunk_id in chunk_ids:
+        range_read = chunks_d[chunk_id]
+        row_ids = np.empty(len(range_read), dtype=basetypes.NODE_ID)
+        max_children_ids = np.empty(len(range_read), dtype=basetypes.NODE_ID)
+        for i, (row_id, row_data) in enumerate(range_read.items()):
+            row_ids[i] = row_id
+            max_children_ids[i] = np.max(row_data[0].value)
+        # all rows are in the same chunk, one mask extracts every segment id
+        segment_ids = row_ids & cg.get_segment_id_limit(chunk_id)
+        result.append(filter_failed_node_ids(row_ids, segment_ids, max_children_ids))
+    print(f"_read_chunks {layer_id} done {sum(len(ids) for ids in result)}")
+    return result
 
 
 def _write_connected_components(
@@ -159,89 +185,128 @@ def _write_connected_components(
         ccs_with_node_ids.append(graph_ids[cc])
 
     if not use_threads:
-        _write(
-            cg,
-            layer_id,
-            parent_coords,
-            ccs_with_node_ids,
-            node_layer_d_shared,
-            time_stamp,
-            use_threads=use_threads,
-        )
+        try:
+            _write(
+                cg,
+                layer_id,
+                parent_coords,
+                ccs_with_node_ids,
+                node_layer_d_shared,
+                time_stamp,
+                use_threads=use_threads,
+            )
+        finally:
+            _PARENT_CHUNK_ID_DICTS.clear()
         return
 
-    task_size = int(math.ceil(len(ccs_with_node_ids) / mp.cpu_count() / 10))
+    task_size = max(1, int(math.ceil(len(ccs_with_node_ids) / mp.cpu_count() / 10)))
     chunked_ccs = chunked(ccs_with_node_ids, task_size)
-    cg_info = cg.get_serialized_info()
     multi_args = []
     for ccs in chunked_ccs:
-        multi_args.append(
-            (cg_info, layer_id, parent_coords, ccs, node_layer_d_shared, time_stamp)
-        )
-    mu.multiprocess_func(
-        _write_components_helper,
-        multi_args,
-        n_threads=min(len(multi_args), mp.cpu_count()),
-    )
+        multi_args.append((layer_id, parent_coords, ccs, time_stamp))
+    with _get_pool(cg, len(multi_args), node_layer_d_shared) as pool:
+        pool.map(_write_components_helper, multi_args)
 
 
 def _write_components_helper(args):
     print("running _write_components_helper")
-    cg_info, layer_id, parent_coords, ccs, node_layer_d_shared, time_stamp = args
-    cg = ChunkedGraph(**cg_info)
-    _write(cg, layer_id, parent_coords, ccs, node_layer_d_shared, time_stamp)
+    layer_id, parent_coords, ccs, time_stamp = args
+    _write(_CG, layer_id, parent_coords, ccs, _NODE_LAYER_D, time_stamp)
 
 
 def _write(
     cg, layer_id, parent_coords, ccs, node_layer_d_shared, time_stamp, use_threads=True
 ):
-    parent_layer_ids = range(layer_id, cg.meta.layer_count + 1)
-    cc_connections = {l: [] for l in parent_layer_ids}
-    for node_ids in ccs:
-        layer = layer_id
-        if len(node_ids) == 1:
-            layer = node_layer_d_shared.get(node_ids[0], cg.meta.layer_count)
-        cc_connections[layer].append(node_ids)
+    # only single node components skip to the layer of their lowest cross edge
+    sizes = np.fromiter((len(cc) for cc in ccs), dtype=int, count=len(ccs))
+    singletons = np.flatnonzero(sizes == 1)
+    cc_layers = np.full(len(ccs), layer_id, dtype=int)
+    cc_layers[singletons] = [
+        node_layer_d_shared.get(ccs[i][0], cg.meta.layer_count) for i in singletons
+    ]
+    # every component must land in one of the buckets below
+    invalid = (cc_layers < layer_id) | (cc_layers > cg.meta.layer_count)
+    if np.any(invalid):
+        raise ValueError(
+            f"Component layers {np.unique(cc_layers[invalid]).tolist()} are outside"
+            f" of layers {layer_id} to {cg.meta.layer_count}."
+        )
+    cc_connections = {}
+    for layer in range(layer_id, cg.meta.layer_count + 1):
+        cc_connections[layer] = [ccs[i] for i in np.flatnonzero(cc_layers == layer)]
 
     rows = []
+    n_rows = 0
+    pending_writes = deque()
+    with ThreadPoolExecutor(max_workers=MAX_PENDING_WRITES) as executor:
+        for row in _create_rows(
+            cg, layer_id, parent_coords, cc_connections, time_stamp, use_threads
+        ):
+            rows.append(row)
+            if len(rows) >= WRITE_BATCH_SIZE:
+                # write in the background and keep building the next batch
+                pending_writes.append(executor.submit(cg.client.write, rows))
+                n_rows += len(rows)
+                rows = []
+                while len(pending_writes) > MAX_PENDING_WRITES:
+                    pending_writes.popleft().result()
+        pending_writes.append(executor.submit(cg.client.write, rows))
+        n_rows += len(rows)
+        # re-raises a failed write
+        for write in pending_writes:
+            write.result()
+    print("wrote rows", n_rows, layer_id, parent_coords)
+
+
+def _create_rows(cg, layer_id, parent_coords, cc_connections, time_stamp, use_threads):
     x, y, z = parent_coords
     parent_chunk_id = cg.get_chunk_id(layer=layer_id, x=x, y=y, z=z)
-    parent_chunk_id_dict = cg.get_parent_chunk_id_dict(parent_chunk_id)
+    parent_chunk_id_dict = _get_parent_chunk_id_dict(cg, parent_chunk_id)
 
     # Iterate through layers
-    for parent_layer_id in parent_layer_ids:
-        if len(cc_connections[parent_layer_id]) == 0:
+    for parent_layer_id, ccs in cc_connections.items():
+        if len(ccs) == 0:
             continue
 
         parent_chunk_id = parent_chunk_id_dict[parent_layer_id]
         reserved_parent_ids = cg.id_client.create_node_ids(
             parent_chunk_id,
-            size=len(cc_connections[parent_layer_id]),
+            size=len(ccs),
             root_chunk=parent_layer_id == cg.meta.layer_count and use_threads,
         )
 
-        for i_cc, node_ids in enumerate(cc_connections[parent_layer_id]):
-            parent_id = reserved_parent_ids[i_cc]
-            for node_id in node_ids:
-                rows.append(
-                    cg.client.mutate_row(
-                        serializers.serialize_uint64(node_id),
-                        {attributes.Hierarchy.Parent: parent_id},
-                        time_stamp=time_stamp,
-                    )
-                )
-
-            rows.append(
-                cg.client.mutate_row(
-                    serializers.serialize_uint64(parent_id),
-                    {attributes.Hierarchy.Child: node_ids},
-                    time_stamp=time_stamp,
-                )
+        # flat layout: nodes of all components, their parents and component offsets
+        # a bigtable row is still created per node, that dominates the cost here
+        sizes = np.fromiter((len(cc) for cc in ccs), dtype=int, count=len(ccs))
+        all_nodes = np.concatenate(ccs)
+        parent_per_node = np.repeat(reserved_parent_ids, sizes)
+        # python ints format into row keys faster than numpy scalars
+        for node_id, parent_id in zip(all_nodes.tolist(), parent_per_node):
+            yield cg.client.mutate_row(
+                serializers.serialize_uint64(node_id),
+                {attributes.Hierarchy.Parent: parent_id},
+                time_stamp=time_stamp,
             )
 
-            if len(rows) > 100000:
-                cg.client.write(rows)
-                print("wrote rows", len(rows), layer_id, parent_coords)
-                rows = []
-    cg.client.write(rows)
-    print("wrote rows", len(rows), layer_id, parent_coords)
+        start = 0
+        for parent_id, end in zip(reserved_parent_ids, np.cumsum(sizes).tolist()):
+            yield cg.client.mutate_row(
+                serializers.serialize_uint64(parent_id),
+                {attributes.Hierarchy.Child: all_nodes[start:end]},
+                time_stamp=time_stamp,
+            )
+            start = end
+
+
+def _get_parent_chunk_id_dict(cg: ChunkedGraph, chunk_id: int) -> Dict:
+    """
+    Cached per pool worker, every write task of a parent chunk asks for the same ids.
+    The cache is reset with the worker's ChunkedGraph, the non pool path clears it
+    after each layer. The returned dict is shared, do not modify it.
+    """
+    try:
+        return _PARENT_CHUNK_ID_DICTS[chunk_id]
+    except KeyError:
+        result = cg.get_parent_chunk_id_dict(chunk_id)
+        _PARENT_CHUNK_ID_DICTS[chunk_id] = result
+        return result
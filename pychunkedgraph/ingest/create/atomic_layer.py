@@ -69,7 +69,7 @@ def _get_chunk_nodes_and_edges(chunk_edges_d: dict, isolated_ids: Sequence[int])
     """
     in-chunk edges and nodes_ids
     """
-    isolated_nodes_self_edges = np.vstack([isolated_ids, isolated_ids]).T
+    isolated_nodes_self_edges = np.repeat(isolated_ids, 2).reshape(-1, 2)
     node_ids = [isolated_ids]
     edge_ids = [isolated_nodes_self_edges]
     for edge_type in EDGE_TYPES:
@@ -80,7 +80,7 @@ def _get_chunk_nodes_and_edges(chunk_edges_d: dict, isolated_ids: Sequence[int])
             edge_ids.append(edges.get_pairs())
 
     chunk_node_ids = np.unique(np.concatenate(node_ids))
-    edge_ids.append(np.vstack([chunk_node_ids, chunk_node_ids]).T)
+    edge_ids.append(np.repeat(chunk_node_ids, 2).reshape(-1, 2))
     return (chunk_node_ids, np.concatenate(edge_ids))
 
 
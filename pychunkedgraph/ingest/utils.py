@@ -47,26 +47,29 @@ def postprocess_edge_data(im, edge_dict):
     if data_version == 2:
         return edge_dict
     elif data_version in [3, 4]:
+        resolution = im.cg_meta.resolution
         new_edge_dict = {}
         for k in edge_dict:
             new_edge_dict[k] = {}
             if edge_dict[k] is None or len(edge_dict[k]) == 0:
                 continue
 
+            # per column products keep the dtype of the columns, a matrix
+            # product with the resolution array would promote it
+            data = edge_dict[k]
             areas = (
-                edge_dict[k]["area_x"] * im.cg_meta.resolution[0]
-                + edge_dict[k]["area_y"] * im.cg_meta.resolution[1]
-                + edge_dict[k]["area_z"] * im.cg_meta.resolution[2]
+                data["area_x"] * resolution[0]
+                + data["area_y"] * resolution[1]
+                + data["area_z"] * resolution[2]
             )
-
             affs = (
-                edge_dict[k]["aff_x"] * im.cg_meta.resolution[0]
-                + edge_dict[k]["aff_y"] * im.cg_meta.resolution[1]
-                + edge_dict[k]["aff_z"] * im.cg_meta.resolution[2]
+                data["aff_x"] * resolution[0]
+                + data["aff_y"] * resolution[1]
+                + data["aff_z"] * resolution[2]
             )
 
-            new_edge_dict[k]["sv1"] = edge_dict[k]["sv1"]
-            new_edge_dict[k]["sv2"] = edge_dict[k]["sv2"]
+            new_edge_dict[k]["sv1"] = data["sv1"]
+            new_edge_dict[k]["sv2"] = data["sv2"]
             new_edge_dict[k]["area"] = areas
             new_edge_dict[k]["aff"] = affs
 
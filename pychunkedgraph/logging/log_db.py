@@ -1,6 +1,7 @@
 # pylint: disable=invalid-name, missing-docstring, too-many-arguments
 
 import os
+import logging
 import threading
 import time
 import queue
@@ -9,9 +10,17 @@ from datetime import datetime
 from google.api_core.exceptions import GoogleAPIError
 from datastoreflex import DatastoreFlex
 
+from pychunkedgraph.utils.gcloud import get_default_credentials
+
 
 ENABLE_LOGS = os.environ.get("PCG_SERVER_ENABLE_LOGS", "") != ""
 LOG_DB_CACHE = {}
+# entries are dropped when the writer falls this far behind
+LOG_QUEUE_SIZE = int(os.environ.get("PCG_SERVER_LOGS_QUEUE_SIZE", 10000))
+_LOG_DB_LOCK = threading.Lock()
+# dropped entries are reported once per this many
+LOG_DROPPED_EVERY = 1000
+logger = logging.getLogger(__name__)
 
 EXCLUDE_FROM_INDEX = os.environ.get(
     "PCG_SERVER_LOGS_INDEX_EXCLUDE", "args, time_ms, user_id"
@@ -24,7 +33,9 @@ class LogDB:
         self._graph_id = graph_id
         self._client = client
         self._kind = f"server_logs_{self._graph_id}"
-        self._q = queue.Queue()
+        self._q = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        self._dropped = 0
+        self._dropped_lock = threading.Lock()
 
     @property
     def graph_id(self):
@@ -34,6 +45,24 @@ class LogDB:
     def client(self):
         return self._client
 
+    @property
+    def dropped(self):
+        return self._dropped
+
+    def _put(self, item):
+        # never block the request path on the writer thread
+        try:
+            self._q.put_nowait(item)
+        except queue.Full:
+            # request threads share the counter
+            with self._dropped_lock:
+                self._dropped += 1
+                dropped = self._dropped
+            if (dropped - 1) % LOG_DROPPED_EVERY == 0:
+                logger.warning(
+                    "%s: log queue full, %d entries dropped.", self._kind, dropped
+                )
+
     def log_endpoint(
         self,
         path,
@@ -54,7 +83,7 @@ class LogDB:
         }
         if operation_id is not None:
             item["operation_id"] = int(operation_id)
-        self._q.put(item)
+        self._put(item)
 
     def log_code_block(self, name: str, operation_id, timestamp, time_ms, **kwargs):
         item = {
@@ -64,20 +93,21 @@ class LogDB:
             "time_ms": time_ms,
         }
         item.update(kwargs)
-        self._q.put(item)
+        self._put(item)
 
     def log_entity(self):
         while True:
+            item = self._q.get()
             try:
-                item = self._q.get_nowait()
                 key = self.client.key(self._kind, namespace=self._client.namespace)
                 entity = self.client.entity(
                     key, exclude_from_indexes=EXCLUDE_FROM_INDEX
                 )
                 entity.update(item)
                 self.client.put(entity)
-            except queue.Empty:
-                time.sleep(1)
+            except Exception:  # pylint: disable=broad-except
+                # a failed write must not stop the logging thread
+                logger.exception("%s: failed to write log entry.", self._kind)
 
 
 def get_log_db(graph_id: str) -> LogDB:
@@ -86,13 +116,25 @@ def get_log_db(graph_id: str) -> LogDB:
     except KeyError:
         ...
 
+    # avoid creating a client and a logging thread per concurrent request
+    with _LOG_DB_LOCK:
+        try:
+            return LOG_DB_CACHE[graph_id]
+        except KeyError:
+            return _create_log_db(graph_id)
+
+
+def _create_log_db(graph_id: str) -> LogDB:
     try:
         project = os.environ["PCG_SERVER_LOGS_PROJECT"]
     except KeyError as err:
         raise GoogleAPIError(f"Datastore project env not set: {err}") from err
 
     namespace = os.environ.get("PCG_SERVER_LOGS_NS", "pcg_server_logs_test")
-    client = DatastoreFlex(project=project, namespace=namespace)
+    credentials, _ = get_default_credentials()
+    client = DatastoreFlex(
+        project=project, namespace=namespace, credentials=credentials
+    )
 
     log_db = LogDB(graph_id, client=client)
     LOG_DB_CACHE[graph_id] = log_db
@@ -0,0 +1,44 @@
+import logging
+
+import pytest
+from flask import Flask
+
+from ..app import common
+
+
+def _app(debug):
+    app = Flask(__name__)
+    app.debug = debug
+    app.before_request(common.before_request)
+    app.register_error_handler(Exception, common.unhandled_exception)
+
+    @app.route("/fail")
+    def fail():
+        raise RuntimeError("boom")
+
+    return app
+
+
+class TestUnhandledException:
+    @pytest.mark.timeout(30)
+    def test_traceback_not_sent_without_debug(self):
+        resp = _app(debug=False).test_client().get("/fail")
+        assert resp.status_code == 500
+        assert resp.get_json()["message"] == "boom"
+        assert "traceback" not in resp.get_json()
+
+    @pytest.mark.timeout(30)
+    def test_debug_sends_traceback_lines(self):
+        resp = _app(debug=True).test_client().get("/fail")
+        tb = resp.get_json()["traceback"]
+        assert isinstance(tb, list) and len(tb) > 1
+        assert tb[-1] == "RuntimeError: boom\n"
+
+    @pytest.mark.timeout(30)
+    def test_logged_traceback_is_one_string(self, caplog):
+        app = _app(debug=False)
+        with caplog.at_level(logging.ERROR, logger=app.logger.name):
+            app.test_client().get("/fail")
+        (record,) = [r for r in caplog.records if isinstance(r.msg, dict)]
+        assert isinstance(record.msg["traceback"], str)
+        assert record.msg["traceback"].endswith("RuntimeError: boom\n")
@@ -0,0 +1,331 @@
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+import numpy as np
+import orjson
+import pytest
+from flask import Flask
+
+from ..app import app_utils
+from ..app import CustomJSONProvider
+
+
+class TestToBinary:
+    @pytest.mark.timeout(30)
+    @pytest.mark.parametrize(
+        "ids",
+        [
+            [],
+            [1, 2, 3],
+            list(range(20)),
+            [np.iinfo(np.uint64).max, 0],
+            np.array([5, 6], dtype=np.uint64),
+            np.array([5, 6], dtype=np.int64),
+            np.array([5, 6], dtype=np.uint32),
+            np.arange(12, dtype=np.uint64).reshape(3, 4)[:, 1],
+        ],
+    )
+    def test_matches_uint64_bytes(self, ids):
+        expected = np.array(ids, dtype=np.uint64).tobytes()
+        assert app_utils.tobinary(ids) == expected
+
+    @pytest.mark.timeout(30)
+    def test_scalar(self):
+        expected = np.array(7, dtype=np.uint64).tobytes()
+        assert app_utils.tobinary(7) == expected
+        assert app_utils.tobinary(np.uint64(7)) == expected
+
+    @pytest.mark.timeout(30)
+    def test_empty_array(self):
+        assert app_utils.tobinary(np.array([])) == b""
+
+    @pytest.mark.timeout(30)
+    @pytest.mark.parametrize(
+        "ids",
+        [
+            ["123", "4"],
+            np.array(["123", "4"]),
+            np.array(["123", "4"], dtype=object),
+            [1.0, 2.0],
+            np.array([1.5, 2.0]),
+            [-1, 2],
+            np.array([-1, 2]),
+            np.array([-1, 2], dtype=object),
+        ],
+    )
+    def test_rejects_non_uint64(self, ids):
+        with pytest.raises(ValueError):
+            app_utils.tobinary(ids)
+
+
+class TestToBinaryMultiples:
+    @pytest.mark.timeout(30)
+    @pytest.mark.parametrize(
+        "arr",
+        [
+            [],
+            [[1, 2], [3, 4], [5, 6]],
+            [[1], [2, 3], []],
+            [np.array([1, 2], dtype=np.uint64), np.array([3, 4], dtype=np.uint64)],
+            [np.array([], dtype=np.uint64), np.array([], dtype=np.uint64)],
+        ],
+    )
+    def test_matches_per_row(self, arr):
+        expected = [np.array(arr_i, dtype=np.uint64).tobytes() for arr_i in arr]
+        assert app_utils.tobinary_multiples(arr) == expected
+
+    @pytest.mark.timeout(30)
+    @pytest.mark.parametrize(
+        "arr",
+        [
+            [[1.5, 2.0], [3.0, 4.0]],
+            [[1.5], [2.0, 3.0]],
+            [[-1, 2], [3, 4]],
+            [[-1], [2, 3]],
+        ],
+    )
+    def test_same_validation_uniform_and_ragged(self, arr):
+        with pytest.raises(ValueError):
+            app_utils.tobinary_multiples(arr)
+
+
+class TestGetCG:
+    @pytest.fixture()
+    def app_context(self, monkeypatch):
+        monkeypatch.setattr(app_utils, "PCG_CACHE", {})
+        monkeypatch.setattr(app_utils, "_PCG_TABLE_LOCKS", defaultdict(Lock))
+        app = Flask(__name__)
+        with app.app_context():
+            yield app
+
+    @pytest.mark.timeout(30)
+    def test_concurrent_misses_create_one_instance(self, app_context, monkeypatch):
+        created = []
+
+        def create_cg(table_id):
+            time.sleep(0.05)
+            created.append(table_id)
+            app_utils._cache_put(table_id, object())
+            return app_utils.PCG_CACHE[table_id]
+
+        def get_cg(table_id):
+            with app_context.app_context():
+                return app_utils.get_cg(table_id)
+
+        monkeypatch.setattr(app_utils, "_create_cg", create_cg)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            cgs = list(executor.map(get_cg, ["table"] * 8))
+        assert created == ["table"]
+        assert all(cg is cgs[0] for cg in cgs)
+        assert len(app_utils._PCG_TABLE_LOCKS) == 0
+
+    @pytest.mark.timeout(30)
+    def test_unknown_tables_leave_no_locks(self, app_context, monkeypatch):
+        def create_cg(table_id):
+            raise ValueError(f"Graph {table_id} not supported.")
+
+        monkeypatch.setattr(app_utils, "_create_cg", create_cg)
+        for i in range(100):
+            with pytest.raises(ValueError):
+                app_utils.get_cg(f"unknown_{i}")
+        assert len(app_utils._PCG_TABLE_LOCKS) == 0
+
+
+def _json_app(debug=False):
+    app = Flask(__name__)
+    app.json = CustomJSONProvider(app)
+    app.debug = debug
+    return app
+
+
+class TestJsonifyWithKwargs:
+    @pytest.mark.timeout(30)
+    def test_settings_are_per_app(self):
+        data = {"ids": np.array([1, 2], dtype=np.uint64)}
+        with _json_app().app_context():
+            compact = app_utils.jsonify_with_kwargs(data).get_data()
+        with _json_app(debug=True).app_context():
+            pretty = app_utils.jsonify_with_kwargs(data).get_data()
+        assert compact == b'{"ids":[1,2]}\n'
+        assert pretty == b'{\n  "ids": [\n    1, \n    2\n  ]\n}\n'
+
+    @pytest.mark.timeout(30)
+    def test_compact_matches_app_encoder(self):
+        data = {
+            "ids": np.array([1, np.iinfo(np.uint64).max], dtype=np.uint64),
+            "id": np.uint64(3),
+            "values": [1.5, "a", None, True],
+            "nested": {"x": np.array([[1, 2]], dtype=np.int64)},
+        }
+        with _json_app().app_context():
+            fast = app_utils.jsonify_with_kwargs(data, as_response=False)
+            slow = app_utils.json.dumps(data, **app_utils._COMPACT_KW)
+        assert fast == slow
+
+    @pytest.mark.timeout(30)
+    def test_orjson_float_differences(self):
+        # documented differences to the app's encoder
+        data = {"f32": np.float32(0.1), "nan": float("nan")}
+        with _json_app().app_context():
+            resp = app_utils.jsonify_with_kwargs(data, as_response=False)
+        assert resp == '{"f32":0.1,"nan":null}'
+
+    @pytest.mark.timeout(30)
+    def test_response_is_not_direct_passthrough(self):
+        with _json_app().app_context():
+            resp = app_utils.jsonify_with_kwargs({"a": 1})
+        assert resp.direct_passthrough is False
+        assert resp.mimetype == "application/json"
+
+
+class TestJsonifyBytesBody:
+    @pytest.mark.timeout(30)
+    @pytest.mark.parametrize("debug", [False, True])
+    @pytest.mark.parametrize(
+        "leaf_ids",
+        [
+            np.array([], dtype=np.uint64),
+            np.array([1, np.iinfo(np.uint64).max], dtype=np.uint64),
+            np.arange(10, dtype=np.uint64)[::2],
+        ],
+    )
+    def test_matches_jsonify_with_kwargs(self, debug, leaf_ids):
+        # what handle_leaves does for its pre-encoded response
+        with _json_app(debug=debug).app_context():
+            body = orjson.dumps(
+                np.ascontiguousarray(leaf_ids), option=orjson.OPT_SERIALIZE_NUMPY
+            )
+            fast = app_utils.jsonify_bytes_body(body, envelope_key="leaf_ids")
+            slow = app_utils.jsonify_with_kwargs({"leaf_ids": leaf_ids})
+        assert fast.get_data() == slow.get_data()
+        assert fast.mimetype == slow.mimetype
+
+
+def _decode_id_mapping(data: bytes) -> dict:
+    arr = np.frombuffer(data, dtype=np.uint64)
+    mapping = {}
+    i = 0
+    while i < len(arr):
+        key, count = int(arr[i]), int(arr[i + 1])
+        mapping[key] = arr[i + 2 : i + 2 + count]
+        i += 2 + count
+    return mapping
+
+
+class TestToBinaryIdMapping:
+    @pytest.mark.timeout(30)
+    @pytest.mark.parametrize(
+        "mapping",
+        [
+            {},
+            {5: []},
+            {1: [2, 3], np.iinfo(np.uint64).max: np.array([4], dtype=np.uint64)},
+            {"7": np.arange(5, dtype=np.uint64), 8: [], 9: [10]},
+        ],
+    )
+    def test_round_trip(self, mapping):
+        decoded = _decode_id_mapping(app_utils.tobinary_id_mapping(mapping))
+        assert list(decoded) == [int(k) for k in mapping]
+        for key, values in mapping.items():
+            expected = np.asarray(values, dtype=np.uint64)
+            assert np.array_equal(decoded[int(key)], expected)
+
+
+def _baseline_parse_bounds(bounds):
+    return np.array([b.split("-") for b in bounds.split("_")], dtype=int).T
+
+
+class TestParseBounds:
+    @pytest.mark.timeout(30)
+    @pytest.mark.parametrize(
+        "bounds", ["0-10_20-30_40-50", "5-5_0-1_100-2000", "1-2", " 1-2_3-4 "]
+    )
+    def test_matches_baseline(self, bounds):
+        result = app_utils.parse_bounds(bounds)
+        np.testing.assert_array_equal(result, _baseline_parse_bounds(bounds))
+        assert result.dtype == _baseline_parse_bounds(bounds).dtype
+
+    @pytest.mark.timeout(30)
+    @pytest.mark.parametrize(
+        "bounds",
+        ["", "_", "-", "1-2_", "1-2__3-4", "1-2_3", "-1-2", "1--2", "a-b"],
+    )
+    def test_rejects_malformed(self, bounds):
+        with pytest.raises(ValueError):
+            _baseline_parse_bounds(bounds)
+        with pytest.raises(ValueError):
+            app_utils.parse_bounds(bounds)
+
+    @pytest.mark.timeout(30)
+    def test_rejects_more_than_two_values_per_axis(self):
+        with pytest.raises(ValueError):
+            app_utils.parse_bounds("1-2-3_4-5-6")
+
+
+class TestToBoolean:
+    @pytest.mark.timeout(30)
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            (True, True),
+            ("true", True),
+            ("TRUE", True),
+            ("1", True),
+            ("false", False),
+            ("False", False),
+            ("0", False),
+        ],
+    )
+    def test_previously_accepted_values(self, value, expected):
+        assert app_utils.toboolean(value) is expected
+
+    @pytest.mark.timeout(30)
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            ("t", True),
+            ("Yes", True),
+            ("y", True),
+            ("f", False),
+            ("no", False),
+            ("N", False),
+            (1, True),
+            (0, False),
+            (False, False),
+        ],
+    )
+    def test_added_values(self, value, expected):
+        assert app_utils.toboolean(value) is expected
+
+    @pytest.mark.timeout(30)
+    @pytest.mark.parametrize(
+        "value", [None, "", "maybe", " true", 1.0, [], [1], np.bool_(True)]
+    )
+    def test_rejects(self, value):
+        with pytest.raises(ValueError):
+            app_utils.toboolean(value)
+
+
+class TestConfigSnapshots:
+    @pytest.mark.timeout(30)
+    def test_per_app(self):
+        apps = []
+        for graph_id in ("a", "b"):
+            app = Flask(__name__)
+            app.config["PCG_GRAPH_IDS"] = [graph_id]
+            app.config["VIRTUAL_TABLES"] = {graph_id: {}}
+            apps.append(app)
+
+        for _ in range(2):
+            for app, graph_id in zip(apps, ("a", "b")):
+                with app.app_context():
+                    whitelist = app_utils._get_whitelisted_graph_ids()
+                    assert whitelist == frozenset([graph_id])
+                    assert app_utils._get_virtual_tables() == {graph_id: {}}
+
+    @pytest.mark.timeout(30)
+    def test_no_virtual_tables(self):
+        with Flask(__name__).app_context():
+            assert app_utils._get_virtual_tables() is None
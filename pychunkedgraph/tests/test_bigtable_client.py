@@ -0,0 +1,89 @@
+import logging
+from collections import namedtuple
+from datetime import datetime
+from datetime import timedelta
+
+import numpy as np
+import pytest
+
+from ..graph.client.bigtable.client import Client
+
+Cell = namedtuple("Cell", ("value", "timestamp"))
+T0 = datetime(2020, 1, 1)
+
+
+class FakeLockClient:
+    """Lock cells by root id, read through both read paths of Client."""
+
+    logger = logging.getLogger(__name__)
+
+    def __init__(self, locks):
+        self.locks = locks
+        self.reads = 0
+
+    def read_node(self, node_id, properties=None):
+        self.reads += 1
+        return self.locks.get(node_id, [])
+
+    def read_nodes(self, node_ids=None, properties=None):
+        self.reads += 1
+        return {n: self.locks[n] for n in node_ids if n in self.locks}
+
+    def get_lock_timestamp(self, root_id, operation_id):
+        return Client.get_lock_timestamp(self, root_id, operation_id)
+
+
+def _per_root(client, root_ids, operation_ids):
+    # timestamps read one root at a time, as before the batched read
+    time_stamps = []
+    for root_id, operation_id in zip(root_ids, operation_ids):
+        time_stamp = client.get_lock_timestamp(root_id, operation_id)
+        if time_stamp is None:
+            return None
+        time_stamps.append(time_stamp)
+    if len(time_stamps) == 0:
+        return None
+    return np.min(time_stamps)
+
+
+LOCKS = {
+    np.uint64(1): [Cell(np.uint64(10), T0 + timedelta(seconds=2))],
+    np.uint64(2): [Cell(np.uint64(10), T0)],
+    np.uint64(3): [Cell(np.uint64(11), T0)],
+}
+
+
+class TestConsolidatedLockTimestamp:
+    @pytest.mark.timeout(30)
+    @pytest.mark.parametrize(
+        "root_ids, operation_ids",
+        [
+            ([], []),
+            ([1], [10]),
+            ([1, 2], [10, 10]),
+            ([1, 3], [10, 10]),
+            ([1, 4], [10, 10]),
+            ([3], [11]),
+        ],
+    )
+    def test_matches_per_root_reads(self, root_ids, operation_ids):
+        root_ids = np.array(root_ids, dtype=np.uint64)
+        operation_ids = np.array(operation_ids, dtype=np.uint64)
+        client = FakeLockClient(LOCKS)
+        result = Client.get_consolidated_lock_timestamp(client, root_ids, operation_ids)
+        assert result == _per_root(client, root_ids, operation_ids)
+
+    @pytest.mark.timeout(30)
+    def test_one_read_for_all_roots(self):
+        client = FakeLockClient(LOCKS)
+        root_ids = np.array([1, 2], dtype=np.uint64)
+        operation_ids = np.array([10, 10], dtype=np.uint64)
+        result = Client.get_consolidated_lock_timestamp(client, root_ids, operation_ids)
+        assert result == T0
+        assert client.reads == 1
+
+    @pytest.mark.timeout(30)
+    def test_no_roots_no_read(self):
+        client = FakeLockClient(LOCKS)
+        assert Client.get_consolidated_lock_timestamp(client, [], []) is None
+        assert client.reads == 0
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from ..graph.connectivity.cross_edges import _find_min_layer
+
+
+def _baseline_find_min_layer(ids_l, layers_l):
+    node_layer_d = {}
+    node_ids = np.concatenate(ids_l)
+    layers = np.concatenate(layers_l)
+    for i, node_id in enumerate(node_ids):
+        layer = node_layer_d.get(node_id, layers[i])
+        node_layer_d[node_id] = min(layer, layers[i])
+    return node_layer_d
+
+
+def _arrays(ids_l, layers_l):
+    ids_l = [np.array(ids, dtype=np.uint64) for ids in ids_l]
+    layers_l = [np.array(layers, dtype=np.uint8) for layers in layers_l]
+    return ids_l, layers_l
+
+
+class TestFindMinLayer:
+    @pytest.mark.timeout(30)
+    @pytest.mark.parametrize(
+        "ids_l, layers_l",
+        [
+            ([[]], [[]]),
+            ([[5]], [[3]]),
+            ([[5, 6], [6, 5]], [[4, 3], [5, 2]]),
+            ([[7, 7, 7]], [[5, 3, 4]]),
+            ([[], [2**64 - 1, 1], []], [[], [6, 2], []]),
+        ],
+    )
+    def test_matches_baseline(self, ids_l, layers_l):
+        ids_l, layers_l = _arrays(ids_l, layers_l)
+        result = _find_min_layer(ids_l, layers_l)
+        assert result == _baseline_find_min_layer(ids_l, layers_l)
+        assert all(type(k) is np.uint64 for k in result)
+
+    @pytest.mark.timeout(30)
+    def test_random_against_baseline(self):
+        rng = np.random.default_rng(0)
+        ids_l = [rng.integers(0, 50, 40).astype(np.uint64) for _ in range(5)]
+        layers_l = [rng.integers(3, 8, 40).astype(np.uint8) for _ in range(5)]
+        result = _find_min_layer(ids_l, layers_l)
+        assert result == _baseline_find_min_layer(ids_l, layers_l)
+
+    @pytest.mark.timeout(30)
+    def test_no_results(self):
+        # the old version raised from np.concatenate on an empty list
+        assert _find_min_layer([], []) == {}
@@ -0,0 +1,39 @@
+from functools import reduce
+
+import numpy as np
+import pytest
+
+from ..graph.edges import Edges
+
+
+def _edges(start, n):
+    ids = np.arange(start, start + n, dtype=np.uint64)
+    return Edges(
+        ids,
+        ids + np.uint64(1),
+        affinities=np.linspace(0, 1, n),
+        areas=np.arange(n) + 1,
+    )
+
+
+def _assert_equal(a, b):
+    for attr in ("node_ids1", "node_ids2", "affinities", "areas"):
+        x, y = getattr(a, attr), getattr(b, attr)
+        np.testing.assert_array_equal(x, y)
+        assert x.dtype == y.dtype
+
+
+class TestConcatenate:
+    @pytest.mark.timeout(30)
+    @pytest.mark.parametrize("sizes", [[], [0], [3], [3, 0, 2], [1, 1, 1, 1], [0, 0]])
+    def test_matches_pairwise_add(self, sizes):
+        starts = np.cumsum([0] + sizes)
+        edges_list = [_edges(start, n) for start, n in zip(starts, sizes)]
+        expected = reduce(lambda x, y: x + y, edges_list, Edges([], []))
+        _assert_equal(Edges.concatenate(edges_list), expected)
+
+    @pytest.mark.timeout(30)
+    def test_accepts_iterators(self):
+        edges_list = [_edges(0, 2), _edges(10, 3)]
+        result = Edges.concatenate(iter(edges_list))
+        _assert_equal(result, edges_list[0] + edges_list[1])
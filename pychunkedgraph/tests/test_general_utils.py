@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from ..utils.general import unique2d
+
+
+class TestUnique2d:
+    @pytest.mark.timeout(30)
+    @pytest.mark.parametrize(
+        "rows",
+        [
+            np.empty((0, 2), dtype=np.uint64),
+            [[1, 2]],
+            [[1, 2], [1, 2]],
+            [[2, 1], [1, 2], [1, 1], [2, 1]],
+            [[2**64 - 1, 0], [0, 2**64 - 1], [2**64 - 1, 0]],
+        ],
+    )
+    def test_matches_unique_axis_0(self, rows):
+        arr = np.array(rows, dtype=np.uint64)
+        result = unique2d(arr)
+        expected = np.unique(arr, axis=0)
+        np.testing.assert_array_equal(result, expected)
+        assert result.dtype == expected.dtype and result.shape == expected.shape
+
+    @pytest.mark.timeout(30)
+    def test_random_against_unique_axis_0(self):
+        rng = np.random.default_rng(0)
+        arr = rng.integers(0, 20, (1000, 2)).astype(np.uint64)
+        np.testing.assert_array_equal(unique2d(arr), np.unique(arr, axis=0))
+
+    @pytest.mark.timeout(30)
+    def test_non_contiguous_input(self):
+        # non contiguous input, lexsort reads the columns directly
+        arr = np.arange(18, dtype=np.uint64).reshape(6, 3)[:, :2] % 4
+        np.testing.assert_array_equal(unique2d(arr), np.unique(arr, axis=0))
@@ -0,0 +1,59 @@
+from collections import defaultdict
+
+import numpy as np
+import pytest
+
+from ..graph.utils.generic import filter_failed_node_ids
+
+
+def _baseline_filter_failed_node_ids(row_ids, segment_ids, max_children_ids):
+    sorting = np.argsort(segment_ids)[::-1]
+    row_ids = row_ids[sorting]
+    max_child_ids = np.array(max_children_ids)[sorting]
+
+    counter = defaultdict(int)
+    max_child_ids_occ_so_far = np.zeros(len(max_child_ids), dtype=int)
+    for i_row in range(len(max_child_ids)):
+        max_child_ids_occ_so_far[i_row] = counter[max_child_ids[i_row]]
+        counter[max_child_ids[i_row]] += 1
+    return row_ids[max_child_ids_occ_so_far == 0]
+
+
+class TestFilterFailedNodeIds:
+    @pytest.mark.timeout(30)
+    @pytest.mark.parametrize(
+        "segment_ids, max_children_ids",
+        [
+            ([], []),
+            ([1], [10]),
+            ([1, 2, 3], [10, 11, 12]),
+            ([1, 2, 3], [10, 10, 10]),
+            ([3, 1, 2, 4], [10, 11, 10, 11]),
+        ],
+    )
+    def test_matches_baseline(self, segment_ids, max_children_ids):
+        segment_ids = np.array(segment_ids, dtype=np.uint64)
+        row_ids = segment_ids + np.uint64(1000)
+        args = (row_ids, segment_ids, max_children_ids)
+        result = filter_failed_node_ids(*args)
+        expected = _baseline_filter_failed_node_ids(*args)
+        np.testing.assert_array_equal(result, expected)
+        assert result.dtype == expected.dtype
+
+    @pytest.mark.timeout(30)
+    def test_keeps_latest_node_per_max_child(self):
+        # segments 2 and 4 are the latest nodes created for children 10 and 11
+        segment_ids = np.array([3, 1, 2, 4], dtype=np.uint64)
+        result = filter_failed_node_ids(segment_ids, segment_ids, [10, 11, 10, 11])
+        np.testing.assert_array_equal(result, [4, 3])
+
+    @pytest.mark.timeout(30)
+    def test_random_against_baseline(self):
+        rng = np.random.default_rng(0)
+        segment_ids = rng.permutation(500).astype(np.uint64)
+        row_ids = segment_ids | np.uint64(2**56)
+        max_children_ids = rng.integers(0, 100, 500).astype(np.uint64)
+        args = (row_ids, segment_ids, max_children_ids)
+        np.testing.assert_array_equal(
+            filter_failed_node_ids(*args), _baseline_filter_failed_node_ids(*args)
+        )
@@ -0,0 +1,180 @@
+import numpy as np
+import pytest
+
+from ..graph import attributes
+from ..graph.utils import serializers
+from ..ingest.create import abstract_layers
+
+
+@pytest.fixture(autouse=True)
+def parent_chunk_id_dicts(monkeypatch):
+    monkeypatch.setattr(abstract_layers, "_PARENT_CHUNK_ID_DICTS", {})
+
+
+class FakeClient:
+    def __init__(self):
+        self.written = []
+
+    def write(self, rows):
+        self.written.extend(rows)
+
+    def mutate_row(self, row_key, val_dict, time_stamp=None):
+        return row_key, val_dict, time_stamp
+
+
+class FakeIdClient:
+    def __init__(self):
+        self.counter = 1000
+
+    def create_node_ids(self, chunk_id, size, root_chunk=False):
+        ids = np.arange(self.counter, self.counter + size, dtype=np.uint64)
+        self.counter += size
+        return ids
+
+
+class FakeMeta:
+    layer_count = 4
+
+
+class FakeCG:
+    """Chunk ids are the layer, each layer is its own parent chunk."""
+
+    def __init__(self):
+        self.meta = FakeMeta()
+        self.client = FakeClient()
+        self.id_client = FakeIdClient()
+
+    def get_chunk_id(self, layer, x, y, z):
+        return layer
+
+    def get_parent_chunk_id_dict(self, chunk_id):
+        return {l: l for l in range(chunk_id, self.meta.layer_count + 1)}
+
+
+def _expected_rows(cc_connections, parent_ids):
+    # per component construction, as rows were built before the flat layout
+    rows = []
+    for layer, ccs in cc_connections.items():
+        for node_ids, parent_id in zip(ccs, parent_ids[layer]):
+            for node_id in node_ids:
+                rows.append(
+                    (
+                        serializers.serialize_uint64(node_id),
+                        {attributes.Hierarchy.Parent: parent_id},
+                    )
+                )
+            rows.append(
+                (
+                    serializers.serialize_uint64(parent_id),
+                    {attributes.Hierarchy.Child: node_ids},
+                )
+            )
+    return rows
+
+
+def _normalized(rows):
+    result = []
+    for row_key, val_dict in rows:
+        ((column, value),) = val_dict.items()
+        result.append((row_key, column.key, column.serialize(value)))
+    return sorted(result)
+
+
+class TestCreateRows:
+    @pytest.mark.timeout(30)
+    def test_rows_match_per_component_construction(self):
+        cg = FakeCG()
+        cc_connections = {
+            3: [np.array([1, 2, 3], dtype=np.uint64), np.array([4], dtype=np.uint64)],
+            4: [np.array([5], dtype=np.uint64)],
+        }
+        rows = list(
+            abstract_layers._create_rows(
+                cg, 3, (0, 0, 0), cc_connections, "ts", use_threads=False
+            )
+        )
+        assert all(time_stamp == "ts" for _, _, time_stamp in rows)
+
+        parent_ids = {3: np.uint64([1000, 1001]), 4: np.uint64([1002])}
+        expected = _expected_rows(cc_connections, parent_ids)
+        assert _normalized([row[:2] for row in rows]) == _normalized(expected)
+
+    @pytest.mark.timeout(30)
+    def test_empty_layers_create_no_rows(self):
+        cc_connections = {3: [], 4: []}
+        rows = abstract_layers._create_rows(
+            FakeCG(), 3, (0, 0, 0), cc_connections, "ts", use_threads=False
+        )
+        assert list(rows) == []
+
+
+class CountingCG(FakeCG):
+    def __init__(self):
+        super().__init__()
+        self.parent_dict_calls = 0
+
+    def get_parent_chunk_id_dict(self, chunk_id):
+        self.parent_dict_calls += 1
+        return super().get_parent_chunk_id_dict(chunk_id)
+
+
+class TestParentChunkIdDictCache:
+    @pytest.mark.timeout(30)
+    def test_cached_by_chunk_id_without_graph_references(self):
+        cg = CountingCG()
+        first = abstract_layers._get_parent_chunk_id_dict(cg, 3)
+        assert abstract_layers._get_parent_chunk_id_dict(cg, 3) is first
+        assert cg.parent_dict_calls == 1
+        assert list(abstract_layers._PARENT_CHUNK_ID_DICTS) == [3]
+
+    @pytest.mark.timeout(30)
+    def test_worker_init_resets_cache(self, monkeypatch):
+        abstract_layers._PARENT_CHUNK_ID_DICTS[3] = {}
+        monkeypatch.setattr(abstract_layers, "ChunkedGraph", lambda **kwargs: None)
+        abstract_layers._init_worker({})
+        assert abstract_layers._PARENT_CHUNK_ID_DICTS == {}
+
+
+def _parents(rows):
+    parents = {}
+    for row_key, val_dict, _ in rows:
+        if attributes.Hierarchy.Parent in val_dict:
+            parents[row_key] = val_dict[attributes.Hierarchy.Parent]
+    return parents
+
+
+class TestWrite:
+    @pytest.mark.timeout(30)
+    def test_singletons_skip_to_their_cross_edge_layer(self):
+        cg = FakeCG()
+        ccs = [
+            np.array([1, 2], dtype=np.uint64),
+            np.array([3], dtype=np.uint64),
+            np.array([4], dtype=np.uint64),
+            np.array([5], dtype=np.uint64),
+        ]
+        node_layer_d = {np.uint64(3): 3, np.uint64(4): 4}
+        abstract_layers._write(cg, 3, (0, 0, 0), ccs, node_layer_d, "ts", False)
+
+        # layer 3: [1, 2] and [3], layer 4: [4] and [5] without a cross edge
+        parents = _parents(cg.client.written)
+        expected = {1: 1000, 2: 1000, 3: 1001, 4: 1002, 5: 1003}
+        assert parents == {
+            serializers.serialize_uint64(node_id): parent_id
+            for node_id, parent_id in expected.items()
+        }
+
+    @pytest.mark.timeout(30)
+    @pytest.mark.parametrize("layer", [2, 5])
+    def test_layers_outside_of_parent_layers_raise(self, layer):
+        cg = FakeCG()
+        ccs = [np.array([1, 2], dtype=np.uint64), np.array([3], dtype=np.uint64)]
+        with pytest.raises(ValueError, match=f"Component layers \\[{layer}\\]"):
+            abstract_layers._write(cg, 3, (0, 0, 0), ccs, {3: layer}, "ts", False)
+        assert cg.client.written == []
+
+    @pytest.mark.timeout(30)
+    def test_no_components(self):
+        cg = FakeCG()
+        abstract_layers._write(cg, 3, (0, 0, 0), [], {}, "ts", False)
+        assert cg.client.written == []
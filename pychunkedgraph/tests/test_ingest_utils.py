@@ -0,0 +1,52 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from ..ingest.utils import postprocess_edge_data
+
+
+def _im(resolution, data_version=4):
+    data_source = SimpleNamespace(DATA_VERSION=data_version)
+    return SimpleNamespace(
+        cg_meta=SimpleNamespace(resolution=resolution, data_source=data_source)
+    )
+
+
+def _edges(n):
+    rng = np.random.default_rng(0)
+    edges = {"sv1": np.arange(n, dtype=np.uint64), "sv2": np.arange(n, dtype=np.uint64)}
+    for axis in "xyz":
+        edges[f"area_{axis}"] = rng.integers(0, 100, n, dtype=np.uint64)
+        edges[f"aff_{axis}"] = rng.random(n, dtype=np.float32)
+    return edges
+
+
+class TestPostprocessEdgeData:
+    @pytest.mark.timeout(30)
+    @pytest.mark.parametrize(
+        "resolution", [[8, 8, 40], np.array([8, 8, 40]), np.array([4.0, 4.0, 40.0])]
+    )
+    def test_weighted_by_resolution_in_column_dtype(self, resolution):
+        edges = _edges(5)
+        result = postprocess_edge_data(_im(resolution), {"in": edges})["in"]
+
+        areas = sum(edges[f"area_{a}"] * r for a, r in zip("xyz", resolution))
+        affs = sum(edges[f"aff_{a}"] * r for a, r in zip("xyz", resolution))
+        np.testing.assert_array_equal(result["area"], areas)
+        np.testing.assert_array_equal(result["aff"], affs)
+        assert result["area"].dtype == areas.dtype
+        assert result["aff"].dtype == affs.dtype
+        assert result["sv1"] is edges["sv1"]
+
+    @pytest.mark.timeout(30)
+    def test_empty_edges(self):
+        edge_dict = {"in": None, "between": {}, "cross": _edges(0)}
+        result = postprocess_edge_data(_im([8, 8, 40]), edge_dict)
+        assert result["in"] == {} and result["between"] == {}
+        assert result["cross"]["area"].size == 0
+
+    @pytest.mark.timeout(30)
+    def test_data_version_2_unchanged(self):
+        edge_dict = {"in": _edges(3)}
+        assert postprocess_edge_data(_im([8, 8, 40], 2), edge_dict) is edge_dict
@@ -0,0 +1,70 @@
+import threading
+import time
+
+import pytest
+
+from ..logging import log_db
+
+
+class FakeDatastore:
+    namespace = "test"
+
+    def __init__(self, fail_on=()):
+        self.fail_on = set(fail_on)
+        self.written = []
+
+    def key(self, kind, namespace=None):
+        return (kind, namespace)
+
+    def entity(self, key, exclude_from_indexes=()):
+        return {}
+
+    def put(self, entity):
+        if entity["name"] in self.fail_on:
+            raise RuntimeError(f"failed {entity['name']}")
+        self.written.append(entity)
+
+
+def _wait_for(condition, timeout=5):
+    start = time.time()
+    while not condition():
+        assert time.time() - start < timeout, "timed out"
+        time.sleep(0.01)
+
+
+class TestLogDB:
+    @pytest.mark.timeout(30)
+    def test_writer_survives_failed_writes(self):
+        client = FakeDatastore(fail_on={"bad"})
+        db = log_db.LogDB("test", client=client)
+        threading.Thread(target=db.log_entity, daemon=True).start()
+
+        for name in ("a", "bad", "b"):
+            db.log_code_block(name, operation_id=1, timestamp=None, time_ms=0)
+        _wait_for(lambda: len(client.written) == 2)
+        assert [e["name"] for e in client.written] == ["a", "b"]
+
+    @pytest.mark.timeout(30)
+    def test_full_queue_drops_entries(self, monkeypatch):
+        monkeypatch.setattr(log_db, "LOG_QUEUE_SIZE", 2)
+        db = log_db.LogDB("test", client=FakeDatastore())
+        # no writer thread, the queue only fills up
+        for i in range(5):
+            db.log_code_block(str(i), operation_id=1, timestamp=None, time_ms=0)
+        assert db.dropped == 3
+
+    @pytest.mark.timeout(30)
+    def test_dropped_count_is_exact_across_threads(self, monkeypatch):
+        monkeypatch.setattr(log_db, "LOG_QUEUE_SIZE", 1)
+        db = log_db.LogDB("test", client=FakeDatastore())
+
+        def log_many():
+            for _ in range(1000):
+                db.log_code_block("x", operation_id=1, timestamp=None, time_ms=0)
+
+        threads = [threading.Thread(target=log_many) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert db.dropped == 8 * 1000 - 1
@@ -259,3 +259,83 @@
 #     """TypeError when encountering unknown log row"""
 #     with pytest.raises(TypeError):
 #         GraphEditOperation.from_log_record(cg, FakeLogRecords.UNKNOWN.record)
+
+
+import numpy as np
+import pytest
+
+from ..graph.exceptions import PreconditionError
+from ..graph.operation import MergeOperation
+from ..graph.operation import MulticutOperation
+from ..graph.operation import SplitOperation
+from ..graph.operation import _ids_intersect
+
+
+class LayerCG:
+    """Only answers chunk layer lookups, ids >= 100 are not supervoxels."""
+
+    def get_chunk_layers(self, node_ids):
+        return np.where(np.asarray(node_ids) >= 100, 2, 1)
+
+
+def _merge(edges):
+    return MergeOperation(
+        LayerCG(),
+        user_id="test",
+        added_edges=edges,
+        source_coords=None,
+        sink_coords=None,
+    )
+
+
+def _split(edges):
+    return SplitOperation(LayerCG(), user_id="test", removed_edges=edges)
+
+
+def _multicut(edges):
+    source_ids, sink_ids = np.asarray(edges).T
+    return MulticutOperation(
+        LayerCG(),
+        user_id="test",
+        source_ids=source_ids,
+        sink_ids=sink_ids,
+        source_coords=None,
+        sink_coords=None,
+        bbox_offset=(240, 240, 24),
+    )
+
+
+@pytest.mark.parametrize("operation", [_merge, _split, _multicut])
+def test_supervoxel_ids_accepted(operation):
+    operation([[1, 2], [3, 4]])
+
+
+@pytest.mark.parametrize("operation", [_merge, _split, _multicut])
+def test_non_supervoxel_ids_raise_precondition_error(operation):
+    # raised instead of an assert, endpoints answer it with a 400
+    with pytest.raises(PreconditionError, match="IDs must be supervoxels, got 101"):
+        operation([[1, 2], [3, 101]])
+
+
+@pytest.mark.parametrize(
+    "ids1, ids2",
+    [
+        ([], []),
+        ([], [1]),
+        ([1, 2], [3, 4]),
+        ([1, 2], [2, 3]),
+        ([2**64 - 1], [2**64 - 1]),
+        (list(range(40)), list(range(40, 80))),
+        (list(range(40)), list(range(39, 80))),
+    ],
+)
+def test_ids_intersect_matches_in1d(ids1, ids2):
+    # both the set path for small inputs and the numpy path for large ones
+    ids1 = np.array(ids1, dtype=np.uint64)
+    ids2 = np.array(ids2, dtype=np.uint64)
+    assert _ids_intersect(ids1, ids2) == np.any(np.in1d(ids1, ids2))
+
+
+def test_multicut_overlapping_sources_and_sinks_raise():
+    with pytest.raises(PreconditionError, match="both sink and source"):
+        _multicut([[1, 2], [3, 1]])
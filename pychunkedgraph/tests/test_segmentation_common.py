@@ -0,0 +1,99 @@
+import numpy as np
+import orjson
+import pytest
+from flask import Flask
+
+from ..app import app_utils
+from ..app.segmentation import common
+from ..graph import exceptions
+
+
+@pytest.fixture(scope="module")
+def app():
+    return Flask(__name__)
+
+
+class TestGetRequestIds:
+    IDS = np.array([1, 2, np.iinfo(np.uint64).max], dtype=np.uint64)
+
+    @pytest.mark.timeout(30)
+    @pytest.mark.parametrize(
+        "content_type", ["application/json", "application/octet-stream"]
+    )
+    def test_json_body(self, app, content_type):
+        # the content type alone does not switch to binary input
+        data = orjson.dumps({"node_ids": self.IDS.tolist()})
+        with app.test_request_context(
+            method="POST", data=data, content_type=content_type
+        ):
+            ids = common._get_request_ids("node_ids")
+        assert ids.dtype == np.uint64
+        assert np.array_equal(ids, self.IDS)
+
+    @pytest.mark.timeout(30)
+    def test_json_body_empty(self, app):
+        data = orjson.dumps({"node_ids": []})
+        with app.test_request_context(method="POST", data=data):
+            ids = common._get_request_ids("node_ids")
+        assert ids.dtype == np.uint64 and ids.size == 0
+
+    @pytest.mark.timeout(30)
+    def test_binary_body(self, app):
+        data = self.IDS.tobytes()
+        with app.test_request_context(
+            method="POST", data=data, query_string="binary=1"
+        ):
+            ids = common._get_request_ids("node_ids")
+        assert np.array_equal(ids, self.IDS)
+        with app.test_request_context(method="POST", data=data):
+            ids = common._get_request_ids("node_ids", is_binary=True)
+        assert np.array_equal(ids, self.IDS)
+
+    @pytest.mark.timeout(30)
+    def test_binary_body_empty(self, app):
+        with app.test_request_context(method="POST", data=b"", query_string="binary=1"):
+            ids = common._get_request_ids("node_ids")
+        assert ids.dtype == np.uint64 and ids.size == 0
+
+    @pytest.mark.timeout(30)
+    def test_binary_body_partial_id(self, app):
+        data = self.IDS.tobytes()[:-1]
+        with app.test_request_context(
+            method="POST", data=data, query_string="binary=1"
+        ):
+            with pytest.raises(exceptions.BadRequest):
+                common._get_request_ids("node_ids")
+
+
+class TestIsinSorted:
+    @pytest.mark.timeout(30)
+    @pytest.mark.parametrize(
+        "values, keys",
+        [
+            ([], []),
+            ([], [1, 5]),
+            ([1, 5], []),
+            ([0, 1, 5, 7, 2**40], [1, 7, 2**40]),
+            ([2**64 - 1, 0, 3], [3, 2**64 - 1]),
+            ([10, 20, 30], [5, 15, 25]),
+        ],
+    )
+    def test_matches_isin(self, values, keys):
+        values = np.array(values, dtype=np.uint64)
+        keys = np.sort(np.array(keys, dtype=np.uint64))
+        result = common._isin_sorted(values, keys)
+        np.testing.assert_array_equal(result, np.isin(values, keys))
+        assert result.dtype == bool and result.shape == values.shape
+
+    @pytest.mark.timeout(30)
+    @pytest.mark.parametrize("spread", [1, 3, 1000])
+    def test_dense_and_sparse_keys(self, spread):
+        # spread 1 and 3 use the lookup table, 1000 the searchsorted path
+        rng = np.random.default_rng(0)
+        offset = np.uint64(2**63)
+        keys = np.sort(
+            rng.choice(200 * spread, 100, replace=False).astype(np.uint64) + offset
+        )
+        values = rng.integers(0, 200 * spread, 300).astype(np.uint64) + offset
+        result = common._isin_sorted(values, keys)
+        np.testing.assert_array_equal(result, np.isin(values, keys))
@@ -495,6 +495,11 @@ class TestGraphBuild:
         assert len(cg.range_read_chunk(cg.get_chunk_id(layer=3, x=0, y=0, z=0))) == 0
         assert len(cg.range_read_chunk(cg.get_chunk_id(layer=4, x=0, y=0, z=0))) == 6
 
+        chunk_ids = [cg.get_chunk_id(layer=2, x=x, y=0, z=0) for x in range(2)]
+        chunks_d = cg.range_read_chunks(chunk_ids)
+        for chunk_id in chunk_ids:
+            assert chunks_d[chunk_id].keys() == cg.range_read_chunk(chunk_id).keys()
+
         assert cg.get_chunk_layer(cg.get_root(to_label(cg, 1, 0, 0, 0, 1))) == 4
         assert cg.get_chunk_layer(cg.get_root(to_label(cg, 1, 0, 0, 0, 2))) == 4
         assert cg.get_chunk_layer(cg.get_root(to_label(cg, 1, 1, 0, 0, 1))) == 4
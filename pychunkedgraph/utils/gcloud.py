@@ -0,0 +1,21 @@
+"""
+google cloud helper funtions
+"""
+
+import os
+from functools import lru_cache
+
+from google.auth import default as default_creds
+
+
+@lru_cache(maxsize=1)
+def get_default_credentials():
+    """
+    Application default credentials and project, resolved once per process.
+    Resolution does disk/metadata server IO, share the result between clients
+    (bigtable, datastore) instead of letting each client resolve them again.
+    Returns (None, None) with the bigtable emulator, clients handle that case.
+    """
+    if "BIGTABLE_EMULATOR_HOST" in os.environ:
+        return None, None
+    return default_creds()
@@ -31,6 +31,20 @@ def chunked(l: Sequence, n: int):
         yield l[i : i + n]
 
 
+def unique2d(arr: np.ndarray) -> np.ndarray:
+    """
+    Sorted unique rows of a Nx2 array, same as np.unique(arr, axis=0).
+    A lexsort on the two columns avoids the void dtype comparisons of `axis=0`.
+    """
+    if arr.shape[0] == 0:
+        return arr
+    arr = arr[np.lexsort((arr[:, 1], arr[:, 0]))]
+    mask = np.empty(arr.shape[0], dtype=bool)
+    mask[0] = True
+    np.any(arr[1:] != arr[:-1], axis=1, out=mask[1:])
+    return arr[mask]
+
+
 def in2d(arr1: np.ndarray, arr2: np.ndarray) -> np.ndarray:
     arr1_view = arr1.view(dtype="u8,u8").reshape(arr1.shape[0])
     arr2_view = arr2.view(dtype="u8,u8").reshape(arr2.shape[0])